@@ -0,0 +1,110 @@
+"""``async def`` versions of the analytics endpoints, enabled with API_ASYNC_DB.
+
+Each handler awaits its query on an AsyncSession instead of holding a
+threadpool worker for the whole round trip. Statements and response shaping
+come from ``api.queries`` so both routers return identical payloads.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api import queries, schemas
+from api.cache import CachedRoute
+from config import get_settings
+from database.async_session import get_async_session
+
+
+router = APIRouter(prefix="/api", tags=["Analytics"], route_class=CachedRoute)
+
+
+@router.get(
+    "/tickets/top-categories",
+    response_model=List[schemas.TicketCategoryResponse],
+)
+async def get_top_categories(
+    fresh: bool = Query(
+        default=False, description="aggregate live from tickets instead of ticket_summary"
+    ),
+    session: AsyncSession = Depends(get_async_session),
+):
+    if not fresh:
+        rows = (await session.execute(queries.top_categories_summary_stmt())).all()
+        if rows:
+            return queries.category_responses(rows)
+
+    computed_at = datetime.utcnow()
+    rows = (await session.execute(queries.top_categories_live_stmt())).all()
+    return queries.category_responses(rows, computed_at)
+
+
+@router.get(
+    "/tickets/sentiment-summary",
+    response_model=schemas.TicketSentimentSummary,
+)
+async def sentiment_summary(
+    fresh: bool = Query(
+        default=False, description="aggregate live from ticket_nlp instead of ticket_summary"
+    ),
+    session: AsyncSession = Depends(get_async_session),
+):
+    row = None
+    if not fresh:
+        row = (await session.execute(queries.sentiment_summary_stmt())).one()
+        refreshed_at = row.refreshed_at
+    if row is None or row.total is None:
+        row = (await session.execute(queries.sentiment_live_stmt())).one()
+        refreshed_at = datetime.utcnow()
+    return queries.sentiment_response(row, refreshed_at)
+
+
+@router.get(
+    "/tickets/trends",
+    response_model=List[schemas.TicketTrendPoint],
+)
+async def ticket_trends(session: AsyncSession = Depends(get_async_session)):
+    settings = get_settings()
+    result = await session.execute(queries.ticket_trends_stmt(settings.trend_window_days))
+    return queries.trend_points(result.all())
+
+
+@router.get(
+    "/telemetry/events",
+    response_model=List[schemas.TelemetryEventResponse],
+)
+async def telemetry_events(
+    product: Optional[str] = Query(default=None),
+    severity: Optional[str] = Query(default=None, description="health severity filter"),
+    timeframe: Optional[int] = Query(
+        default=None, description="limit to last N days of events"
+    ),
+    limit: int = Query(default=200, ge=1, le=get_settings().telemetry_max_page_size),
+    cursor: Optional[str] = Query(
+        default=None, description="X-Next-Cursor value from the previous page"
+    ),
+    session: AsyncSession = Depends(get_async_session),
+):
+    stmt = queries.telemetry_events_stmt(product, severity, timeframe, limit, cursor)
+    return queries.telemetry_events_response((await session.execute(stmt)).all(), limit)
+
+
+@router.get(
+    "/telemetry/rollups",
+    response_model=List[schemas.TelemetryRollupPoint],
+)
+async def telemetry_rollups(
+    product: Optional[str] = Query(default=None),
+    node_id: Optional[str] = Query(default=None),
+    granularity: schemas.RollupGranularity = Query(default=schemas.RollupGranularity.hour),
+    timeframe: Optional[int] = Query(
+        default=None, ge=1, description="last N days of rollups (default TREND_WINDOW_DAYS)"
+    ),
+    session: AsyncSession = Depends(get_async_session),
+):
+    timeframe = timeframe or get_settings().trend_window_days
+    stmt = queries.telemetry_rollups_stmt(product, node_id, timeframe)
+    return queries.telemetry_rollup_points((await session.execute(stmt)).all(), granularity)
@@ -0,0 +1,238 @@
+"""Response caching for the analytics router, invalidated by ETL data versions."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.concurrency import run_in_threadpool
+
+from config import get_settings
+from database.models import DataVersion
+from database.session import SessionLocal
+
+# Hop-by-hop or per-response headers that must not be replayed from the cache.
+_SKIPPED_HEADERS = {"content-length", "etag", "x-cache"}
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    status_code: int
+    headers: Dict[str, str]
+    media_type: Optional[str]
+    etag: str
+    expires_at: float
+
+
+class ResponseCache:
+    """Size-bounded LRU of serialized responses with a per-entry TTL."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def store(self, key: str, response: Response) -> CachedResponse:
+        entry = CachedResponse(
+            body=response.body,
+            status_code=response.status_code,
+            headers={
+                name: value
+                for name, value in response.headers.items()
+                if name not in _SKIPPED_HEADERS
+            },
+            media_type=response.media_type,
+            etag=f'"{hashlib.sha1(response.body).hexdigest()}"',
+            expires_at=self._clock() + self._ttl_seconds,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+settings = get_settings()
+response_cache = ResponseCache(
+    max_entries=settings.api_cache_max_entries,
+    ttl_seconds=settings.api_cache_ttl_seconds,
+)
+
+
+_DATA_VERSION_STMT = select(DataVersion.name, DataVersion.version).order_by(DataVersion.name)
+
+
+def _format_data_version(rows) -> str:
+    return ",".join(f"{row.name}:{row.version}" for row in rows)
+
+
+def current_data_version() -> str:
+    """Combined version stamp of every dataset the ETL pipelines have loaded."""
+    with SessionLocal() as session:
+        return _format_data_version(session.execute(_DATA_VERSION_STMT).all())
+
+
+async def read_data_version() -> str:
+    return await run_in_threadpool(current_data_version)
+
+
+def async_data_version_reader(engine: AsyncEngine) -> Callable[[], Awaitable[str]]:
+    """``DataVersionTracker`` reader for the async API: no threadpool, no sync pool."""
+
+    async def read() -> str:
+        async with engine.connect() as connection:
+            return _format_data_version((await connection.execute(_DATA_VERSION_STMT)).all())
+
+    return read
+
+
+class DataVersionTracker:
+    """In-memory copy of the data version stamp, polled in the background.
+
+    Requests read the last polled stamp without touching the database, so a
+    load is picked up within ``poll_seconds``. Only the first request, or the
+    first after ``invalidate``, reads the stamp inline.
+    """
+
+    def __init__(
+        self,
+        poll_seconds: float,
+        reader: Callable[[], Awaitable[str]] = read_data_version,
+    ) -> None:
+        self._poll_seconds = poll_seconds
+        self._reader = reader
+        self._value: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def current(self) -> str:
+        value = self._value
+        if value is None:
+            value = await self.refresh()
+        return value
+
+    async def refresh(self) -> str:
+        self._value = await self._reader()
+        return self._value
+
+    def invalidate(self) -> None:
+        """Make the next request re-read the stamp, e.g. after an in-process load."""
+        self._value = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._poll())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self._poll_seconds)
+            try:
+                await self.refresh()
+            except Exception as exc:  # keep serving the last stamp until the DB answers
+                logger.warning("Could not refresh data versions: {}", exc)
+
+
+def cache_key(request: Request, data_version: str) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}#{data_version}"
+
+
+def _bypass_cache(request: Request) -> bool:
+    return (
+        request.method != "GET"
+        or request.query_params.get("fresh", "").lower() in {"1", "true", "yes"}
+        or "no-cache" in request.headers.get("cache-control", "")
+    )
+
+
+def _matches(request: Request, etag: str) -> bool:
+    candidates = request.headers.get("if-none-match", "")
+    return any(tag.strip().removeprefix("W/") == etag for tag in candidates.split(",")) or (
+        candidates.strip() == "*"
+    )
+
+
+def _replay(entry: CachedResponse, request: Request, status: str) -> Response:
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "X-Cache": status}
+    if _matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=entry.body,
+        status_code=entry.status_code,
+        headers={**entry.headers, **headers},
+        media_type=entry.media_type,
+    )
+
+
+class CachedRoute(APIRoute):
+    """APIRoute that serves repeated GETs from ``response_cache``.
+
+    Entries are keyed by path, normalized query string and the current data
+    version, so a bump from the ETL loaders makes every older entry unreachable.
+    The version comes from the app's ``DataVersionTracker`` (``app.state``) when
+    one is configured. ``?fresh=true`` and ``Cache-Control: no-cache`` requests
+    skip the cache.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def cached_handler(request: Request) -> Response:
+            if not settings.api_cache_enabled or _bypass_cache(request):
+                return await handler(request)
+            tracker = getattr(request.app.state, "data_version", None)
+            version = await (tracker.current() if tracker is not None else read_data_version())
+            key = cache_key(request, version)
+            entry = response_cache.get(key)
+            if entry is not None:
+                return _replay(entry, request, "HIT")
+            response = await handler(request)
+            if response.status_code != 200 or not hasattr(response, "body"):
+                return response
+            return _replay(response_cache.store(key, response), request, "MISS")
+
+        return cached_handler
@@ -0,0 +1,174 @@
+"""Streaming bulk exports for BI tools and warehouse syncs."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime, timedelta
+from enum import Enum
+from typing import Iterator, List, Optional
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+
+from api.metrics import record_rows
+from database.models import TelemetryEvent, Ticket, TicketNLP
+from database.session import SessionLocal
+
+# Rows fetched from the server-side cursor and serialized per yielded chunk.
+EXPORT_BATCH_SIZE = 2000
+
+router = APIRouter(prefix="/api/export", tags=["Export"])
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+TELEMETRY_EXPORT_COLUMNS = [
+    TelemetryEvent.event_id,
+    TelemetryEvent.node_id,
+    TelemetryEvent.product,
+    TelemetryEvent.event_type,
+    TelemetryEvent.response_time_ms,
+    TelemetryEvent.cpu_usage,
+    TelemetryEvent.storage_utilization,
+    TelemetryEvent.health_severity,
+    TelemetryEvent.response_time_bucket,
+    TelemetryEvent.created_at,
+]
+
+TICKET_EXPORT_COLUMNS = [
+    Ticket.ticket_id,
+    Ticket.customer_id,
+    Ticket.product,
+    Ticket.issue_description,
+    Ticket.severity,
+    Ticket.status,
+    Ticket.created_at,
+    Ticket.resolved_at,
+    Ticket.resolution_hours,
+    Ticket.severity_score,
+    TicketNLP.predicted_category,
+    TicketNLP.sentiment_label,
+    TicketNLP.sentiment_score,
+]
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Unserializable export value: {value!r}")
+
+
+def _ndjson_chunks(columns: List[str], batches: Iterator[list]) -> Iterator[str]:
+    for rows in batches:
+        record_rows(len(rows))
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), default=_json_default) + "\n" for row in rows
+        )
+
+
+def _csv_chunks(columns: List[str], batches: Iterator[list]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in batches:
+        record_rows(len(rows))
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_rows(stmt: Select, fmt: ExportFormat, compress: bool) -> Iterator[bytes]:
+    """Serialize ``stmt`` batch by batch from a server-side cursor.
+
+    The generator owns its session because the response body is produced after
+    the endpoint (and any request-scoped dependency) has returned.
+    """
+    columns = [column.name for column in stmt.selected_columns]
+    encoder = zlib.compressobj(wbits=31) if compress else None
+    with SessionLocal() as session:
+        result = session.execute(
+            stmt,
+            execution_options={"stream_results": True, "yield_per": EXPORT_BATCH_SIZE},
+        )
+        serialize = _ndjson_chunks if fmt is ExportFormat.ndjson else _csv_chunks
+        for text in serialize(columns, result.partitions()):
+            data = text.encode("utf-8")
+            if encoder is None:
+                yield data
+            else:
+                compressed = encoder.compress(data)
+                if compressed:
+                    yield compressed
+    if encoder is not None:
+        yield encoder.flush()
+
+
+def _export_response(
+    stmt: Select, fmt: ExportFormat, compress: bool, name: str
+) -> StreamingResponse:
+    headers = {"Content-Disposition": f'attachment; filename="{name}.{fmt.value}"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        stream_rows(stmt, fmt, compress), media_type=MEDIA_TYPES[fmt], headers=headers
+    )
+
+
+@router.get("/telemetry")
+def export_telemetry(
+    format: ExportFormat = Query(default=ExportFormat.ndjson),
+    compress: bool = Query(default=False, description="gzip the response body"),
+    product: Optional[str] = Query(default=None),
+    severity: Optional[str] = Query(default=None, description="health severity filter"),
+    timeframe: Optional[int] = Query(
+        default=None, description="limit to last N days of events"
+    ),
+):
+    stmt = select(*TELEMETRY_EXPORT_COLUMNS).order_by(
+        TelemetryEvent.created_at, TelemetryEvent.id
+    )
+    if product:
+        stmt = stmt.where(TelemetryEvent.product == product)
+    if severity:
+        stmt = stmt.where(TelemetryEvent.health_severity == severity)
+    if timeframe:
+        window_start = datetime.utcnow() - timedelta(days=timeframe)
+        stmt = stmt.where(TelemetryEvent.created_at >= window_start)
+    return _export_response(stmt, format, compress, "telemetry")
+
+
+@router.get("/tickets")
+def export_tickets(
+    format: ExportFormat = Query(default=ExportFormat.ndjson),
+    compress: bool = Query(default=False, description="gzip the response body"),
+    product: Optional[str] = Query(default=None),
+    timeframe: Optional[int] = Query(
+        default=None, description="limit to tickets created in the last N days"
+    ),
+):
+    stmt = (
+        select(*TICKET_EXPORT_COLUMNS)
+        .outerjoin(TicketNLP, Ticket.ticket_id == TicketNLP.ticket_id)
+        .order_by(Ticket.created_at, Ticket.id)
+    )
+    if product:
+        stmt = stmt.where(Ticket.product == product)
+    if timeframe:
+        window_start = datetime.utcnow() - timedelta(days=timeframe)
+        stmt = stmt.where(Ticket.created_at >= window_start)
+    return _export_response(stmt, format, compress, "tickets")
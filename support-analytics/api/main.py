@@ -4,7 +4,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 
-from api.router import router
+from api.cache import DataVersionTracker, async_data_version_reader, read_data_version
+from api.export import router as export_router
+from api.metrics import MetricsMiddleware, instrument_engine, metrics_endpoint, registry
 from config import get_settings
 from database.session import Base, engine
 
@@ -23,18 +25,60 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "X-Next-Cursor"],
     )
 
     @app.on_event("startup")
     def startup_event():
-        logger.info("Ensuring database schema exists at %s", settings.database_url)
+        logger.info("Ensuring database schema exists at {}", settings.database_url)
         Base.metadata.create_all(bind=engine)
 
     @app.get("/health", tags=["Health"])
     def health():
         return {"status": "ok"}
 
+    if settings.api_async_db:
+        from api.async_router import router
+        from database.async_session import async_engine
+
+        query_engine = async_engine.sync_engine
+        version_reader = async_data_version_reader(async_engine)
+    else:
+        from api.router import router
+
+        query_engine = engine
+        version_reader = read_data_version
     app.include_router(router)
+    app.include_router(export_router)
+
+    if settings.api_cache_enabled:
+        app.state.data_version = DataVersionTracker(
+            settings.api_cache_version_poll_seconds, reader=version_reader
+        )
+
+        @app.on_event("startup")
+        async def start_data_version_polling():
+            app.state.data_version.start()
+
+        @app.on_event("shutdown")
+        async def stop_data_version_polling():
+            await app.state.data_version.stop()
+
+    if settings.api_async_db:
+        # Registered after the poller's shutdown hook so polling stops first.
+        @app.on_event("shutdown")
+        async def dispose_async_engine():
+            # aiosqlite runs each connection on its own thread; pooled ones would
+            # otherwise outlive the event loop and keep the process alive.
+            await async_engine.dispose()
+
+    if settings.api_metrics_enabled:
+        app.add_api_route("/metrics", metrics_endpoint, include_in_schema=False)
+        instrument_engine(query_engine)
+        # Exports always read through the sync engine.
+        instrument_engine(engine)
+        registry.register_routes(app)
+        app.add_middleware(MetricsMiddleware, registry=registry)
     return app
 
 
@@ -0,0 +1,224 @@
+"""Per-route request, database and result-size metrics in Prometheus text format.
+
+``MetricsMiddleware`` times every HTTP request and attributes it to the matched
+route template. While a request is in flight a ``RequestStats`` object sits in
+a context variable; SQLAlchemy cursor hooks and the response-shaping helpers
+add to it from whichever thread runs the query (Starlette copies the context
+into its threadpool), and the middleware folds it into that route's
+``RouteMetrics`` once the response has been sent.
+
+All folding happens on the event-loop thread, so the counters need no locks.
+Each (method, route) gets its ``RouteMetrics`` and pre-rendered label string
+when the app is built; recording a request never allocates label sets.
+Metrics are per process: scrape every worker when running several.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+UNMATCHED_ROUTE = "unmatched"
+# PlainTextResponse appends "; charset=utf-8".
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+class RequestStats:
+    """Database work attributed to the request currently in flight."""
+
+    __slots__ = ("queries", "query_seconds", "rows")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.rows = 0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def record_rows(count: int) -> None:
+    """Count result rows shaped into the current request's response."""
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.rows += count
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "total", "observations")
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.observations = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.observations += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        lines, cumulative = [], 0
+        for bound, count in zip((*self.bounds, "+Inf"), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total}")
+        lines.append(f"{name}_count{{{labels}}} {self.observations}")
+        return lines
+
+
+class RouteMetrics:
+    __slots__ = ("labels", "responses", "latency", "db_latency", "queries", "rows")
+
+    def __init__(self, method: str, route: str) -> None:
+        self.labels = f'method="{method}",route="{route}"'
+        self.responses = [0] * len(STATUS_CLASSES)
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.db_latency = Histogram(DB_BUCKETS)
+        self.queries = 0
+        self.rows = 0
+
+    def observe(self, status: int, seconds: float, stats: RequestStats) -> None:
+        self.responses[min(max(status // 100, 1), 5) - 1] += 1
+        self.latency.observe(seconds)
+        self.db_latency.observe(stats.query_seconds)
+        self.queries += stats.queries
+        self.rows += stats.rows
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self._unmatched: Dict[str, RouteMetrics] = {}
+
+    def register_routes(self, app: FastAPI) -> None:
+        for route in app.routes:
+            if isinstance(route, APIRoute):
+                for method in sorted(route.methods):
+                    self._routes.setdefault((method, route.path), RouteMetrics(method, route.path))
+
+    def lookup(self, method: str, route: Optional[str]) -> RouteMetrics:
+        metrics = self._routes.get((method, route)) if route is not None else None
+        if metrics is None:
+            metrics = self._unmatched.get(method)
+            if metrics is None:
+                metrics = self._unmatched[method] = RouteMetrics(method, UNMATCHED_ROUTE)
+        return metrics
+
+    def reset(self) -> None:
+        for key in list(self._routes):
+            self._routes[key] = RouteMetrics(*key)
+        self._unmatched.clear()
+
+    def render(self) -> str:
+        routes = [*self._routes.values(), *self._unmatched.values()]
+        lines = [
+            "# HELP api_requests_total HTTP responses by route and status class.",
+            "# TYPE api_requests_total counter",
+        ]
+        for metrics in routes:
+            lines.extend(
+                f'api_requests_total{{{metrics.labels},status="{status}"}} {count}'
+                for status, count in zip(STATUS_CLASSES, metrics.responses)
+                if count
+            )
+        sections = (
+            ("api_request_duration_seconds", "Request latency by route.", "latency"),
+            (
+                "api_request_db_duration_seconds",
+                "Time spent executing SQL per request.",
+                "db_latency",
+            ),
+        )
+        for name, help_text, attribute in sections:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for metrics in routes:
+                lines.extend(getattr(metrics, attribute).render(name, metrics.labels))
+        counters = (
+            ("api_db_queries_total", "SQL statements executed while serving requests.", "queries"),
+            (
+                "api_rows_returned_total",
+                "Database rows shaped into responses; cache hits add none.",
+                "rows",
+            ),
+        )
+        for name, help_text, attribute in counters:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines.extend(
+                f"{name}{{{metrics.labels}}} {getattr(metrics, attribute)}" for metrics in routes
+            )
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streaming bodies are timed to their last chunk."""
+
+    def __init__(self, app, registry: MetricsRegistry = registry) -> None:
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_stats.reset(token)
+            # The router stores the matched route in the shared scope dict.
+            route = scope.get("route")
+            self.registry.lookup(scope["method"], getattr(route, "path", None)).observe(
+                status, elapsed, stats
+            )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _request_stats.get() is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _request_stats.get()
+    started = getattr(context, "_metrics_started", None)
+    if stats is not None and started is not None:
+        stats.queries += 1
+        stats.query_seconds += time.perf_counter() - started
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attribute SQL executed on ``engine`` to the request that issued it."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def metrics_endpoint() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,267 @@
+"""Statement builders and response shaping shared by the sync and async routers."""
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy import Select, case, func, or_, select
+from sqlalchemy.engine import Row
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson optional at runtime
+    orjson = None  # type: ignore
+
+from api import schemas
+from api.metrics import record_rows
+from database.models import (
+    TelemetryEvent,
+    TelemetryHourlyRollup,
+    Ticket,
+    TicketNLP,
+    TicketSummary,
+)
+from database.rollups import (
+    SEVERITY_COLUMNS,
+    decode_counts,
+    floor_hour,
+    histogram_percentile,
+    merge_counts,
+    period_start,
+)
+
+TELEMETRY_EVENT_FIELDS = list(schemas.TelemetryEventResponse.model_fields)
+TELEMETRY_EVENT_COLUMNS = [getattr(TelemetryEvent, field) for field in TELEMETRY_EVENT_FIELDS]
+
+
+def top_categories_summary_stmt() -> Select:
+    return select(
+        TicketSummary.category,
+        TicketSummary.ticket_count,
+        TicketSummary.avg_resolution_hours,
+        TicketSummary.refreshed_at,
+    ).order_by(TicketSummary.ticket_count.desc())
+
+
+def top_categories_live_stmt() -> Select:
+    return (
+        select(
+            TicketNLP.predicted_category.label("category"),
+            func.count(Ticket.ticket_id).label("ticket_count"),
+            func.avg(Ticket.resolution_hours).label("avg_resolution_hours"),
+        )
+        .join(TicketNLP, Ticket.ticket_id == TicketNLP.ticket_id)
+        .group_by(TicketNLP.predicted_category)
+        .order_by(func.count(Ticket.ticket_id).desc())
+    )
+
+
+def category_responses(
+    rows: Sequence[Row], computed_at: Optional[datetime] = None
+) -> List[schemas.TicketCategoryResponse]:
+    """Summary rows carry their own refreshed_at; live rows use ``computed_at``."""
+    record_rows(len(rows))
+    return [
+        schemas.TicketCategoryResponse(
+            category=row.category,
+            ticket_count=row.ticket_count,
+            avg_resolution_hours=round(row.avg_resolution_hours or 0, 2),
+            refreshed_at=computed_at or row.refreshed_at,
+        )
+        for row in rows
+    ]
+
+
+def sentiment_summary_stmt() -> Select:
+    return select(
+        func.sum(TicketSummary.ticket_count).label("total"),
+        func.sum(TicketSummary.positive_count).label("positive"),
+        func.sum(TicketSummary.negative_count).label("negative"),
+        func.sum(TicketSummary.neutral_count).label("neutral"),
+        func.max(TicketSummary.refreshed_at).label("refreshed_at"),
+    )
+
+
+def sentiment_live_stmt() -> Select:
+    return select(
+        func.count().label("total"),
+        func.sum(case((TicketNLP.sentiment_label == "positive", 1), else_=0)).label("positive"),
+        func.sum(case((TicketNLP.sentiment_label == "negative", 1), else_=0)).label("negative"),
+        func.sum(case((TicketNLP.sentiment_label == "neutral", 1), else_=0)).label("neutral"),
+    )
+
+
+def sentiment_response(row: Row, refreshed_at: Optional[datetime]) -> schemas.TicketSentimentSummary:
+    record_rows(1)
+    total = row.total or 1
+    return schemas.TicketSentimentSummary(
+        positive_percent=round((row.positive or 0) / total * 100, 2),
+        negative_percent=round((row.negative or 0) / total * 100, 2),
+        neutral_percent=round((row.neutral or 0) / total * 100, 2),
+        refreshed_at=refreshed_at,
+    )
+
+
+def ticket_trends_stmt(window_days: int) -> Select:
+    start_date = datetime.utcnow() - timedelta(days=window_days)
+    return (
+        select(
+            func.date(Ticket.created_at).label("day"),
+            func.count(Ticket.ticket_id).label("ticket_count"),
+        )
+        .where(Ticket.created_at >= start_date)
+        .group_by(func.date(Ticket.created_at))
+        .order_by(func.date(Ticket.created_at))
+    )
+
+
+def trend_points(rows: Sequence[Row]) -> List[schemas.TicketTrendPoint]:
+    record_rows(len(rows))
+    return [schemas.TicketTrendPoint(date=row.day, ticket_count=row.ticket_count) for row in rows]
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def telemetry_events_stmt(
+    product: Optional[str],
+    severity: Optional[str],
+    timeframe: Optional[int],
+    limit: int,
+    cursor: Optional[str],
+) -> Select:
+    """One page of events plus a look-ahead row that signals whether more remain.
+
+    Keyset pagination on (created_at, id): every page is an index range scan,
+    however deep the client has paged.
+    """
+    stmt = (
+        select(*TELEMETRY_EVENT_COLUMNS, TelemetryEvent.id)
+        .order_by(TelemetryEvent.created_at.desc(), TelemetryEvent.id.desc())
+        .limit(limit + 1)
+    )
+    if product:
+        stmt = stmt.where(TelemetryEvent.product == product)
+    if severity:
+        stmt = stmt.where(TelemetryEvent.health_severity == severity)
+    if timeframe:
+        window_start = datetime.utcnow() - timedelta(days=timeframe)
+        stmt = stmt.where(TelemetryEvent.created_at >= window_start)
+    if cursor:
+        after_created_at, after_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            TelemetryEvent.created_at <= after_created_at,
+            or_(
+                TelemetryEvent.created_at < after_created_at,
+                TelemetryEvent.id < after_id,
+            ),
+        )
+    return stmt
+
+
+def telemetry_events_response(rows: Sequence[Row], limit: int) -> Response:
+    headers: Dict[str, str] = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    record_rows(len(rows))
+    # Columns come straight from the database with the schema's types, so the rows
+    # are serialized as-is instead of being re-validated through response_model.
+    payload = [dict(zip(TELEMETRY_EVENT_FIELDS, row)) for row in rows]
+    if orjson is not None:
+        return ORJSONResponse(payload, headers=headers)
+    return JSONResponse(jsonable_encoder(payload), headers=headers)
+
+
+def telemetry_rollups_stmt(
+    product: Optional[str], node_id: Optional[str], timeframe: int
+) -> Select:
+    rollup = TelemetryHourlyRollup
+    stmt = (
+        select(
+            rollup.hour,
+            rollup.event_count,
+            *(getattr(rollup, column) for column in SEVERITY_COLUMNS.values()),
+            rollup.event_type_counts,
+            rollup.cpu_usage_sum,
+            rollup.cpu_usage_max,
+            rollup.storage_utilization_sum,
+            rollup.storage_utilization_max,
+            rollup.response_time_histogram,
+        )
+        .where(rollup.hour >= floor_hour(datetime.utcnow() - timedelta(days=timeframe)))
+        .order_by(rollup.hour)
+    )
+    if product:
+        stmt = stmt.where(rollup.product == product)
+    if node_id:
+        stmt = stmt.where(rollup.node_id == node_id)
+    return stmt
+
+
+def telemetry_rollup_points(
+    rows: Sequence[Row], granularity: schemas.RollupGranularity
+) -> List[schemas.TelemetryRollupPoint]:
+    """Merge hourly rollup rows (ordered by hour) into one point per period.
+
+    Counts and sums add, maxima take the max and the response-time histograms
+    merge, so period percentiles are exact rather than averages of hourly ones.
+    """
+    record_rows(len(rows))
+    periods: Dict[datetime, dict] = {}
+    for row in rows:
+        start = period_start(row.hour, granularity.value)
+        period = periods.get(start)
+        if period is None:
+            period = periods[start] = {
+                "event_count": 0,
+                "severity_counts": dict.fromkeys(SEVERITY_COLUMNS, 0),
+                "event_type_counts": {},
+                "cpu_sum": 0.0,
+                "cpu_max": row.cpu_usage_max,
+                "storage_sum": 0.0,
+                "storage_max": row.storage_utilization_max,
+                "histogram": {},
+            }
+        period["event_count"] += row.event_count
+        for severity, column in SEVERITY_COLUMNS.items():
+            period["severity_counts"][severity] += getattr(row, column)
+        merge_counts(period["event_type_counts"], decode_counts(row.event_type_counts))
+        period["cpu_sum"] += row.cpu_usage_sum
+        period["cpu_max"] = max(period["cpu_max"], row.cpu_usage_max)
+        period["storage_sum"] += row.storage_utilization_sum
+        period["storage_max"] = max(period["storage_max"], row.storage_utilization_max)
+        merge_counts(period["histogram"], decode_counts(row.response_time_histogram))
+
+    return [
+        schemas.TelemetryRollupPoint(
+            period_start=start,
+            event_count=period["event_count"],
+            severity_counts=period["severity_counts"],
+            event_type_counts=period["event_type_counts"],
+            avg_cpu_usage=round(period["cpu_sum"] / period["event_count"], 2),
+            max_cpu_usage=period["cpu_max"],
+            avg_storage_utilization=round(period["storage_sum"] / period["event_count"], 2),
+            max_storage_utilization=period["storage_max"],
+            p50_response_time_ms=histogram_percentile(period["histogram"], 0.5),
+            p95_response_time_ms=histogram_percentile(period["histogram"], 0.95),
+        )
+        for start, period in periods.items()
+    ]
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from datetime import datetime, date
-from typing import List, Optional
+from enum import Enum
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -10,12 +11,14 @@ class TicketCategoryResponse(BaseModel):
     category: str
     ticket_count: int
     avg_resolution_hours: float
+    refreshed_at: Optional[datetime] = None
 
 
 class TicketSentimentSummary(BaseModel):
     positive_percent: float
     negative_percent: float
     neutral_percent: float
+    refreshed_at: Optional[datetime] = None
 
 
 class TicketTrendPoint(BaseModel):
@@ -36,6 +39,25 @@ class TelemetryEventResponse(BaseModel):
     created_at: datetime
 
 
+class RollupGranularity(str, Enum):
+    hour = "hour"
+    day = "day"
+    week = "week"
+
+
+class TelemetryRollupPoint(BaseModel):
+    period_start: datetime
+    event_count: int
+    severity_counts: Dict[str, int]
+    event_type_counts: Dict[str, int]
+    avg_cpu_usage: float
+    max_cpu_usage: float
+    avg_storage_utilization: float
+    max_storage_utilization: float
+    p50_response_time_ms: Optional[int] = None
+    p95_response_time_ms: Optional[int] = None
+
+
 class TelemetryFilter(BaseModel):
     product: Optional[str] = None
     severity: Optional[str] = None
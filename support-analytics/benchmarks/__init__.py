@@ -0,0 +1,5 @@
+"""Throughput benchmarks for the ETL and API hot paths.
+
+Run from the ``support-analytics`` directory, e.g.
+``python -m benchmarks.sentiment_batching --records 2000``.
+"""
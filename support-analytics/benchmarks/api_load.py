@@ -0,0 +1,145 @@
+"""Load-test the analytics API with the sync vs. async database layer.
+
+Seeds a throwaway SQLite file, then starts ``uvicorn api.main:app`` twice in a
+subprocess (API_ASYNC_DB=false, then true) with the response cache disabled,
+and drives each with ``--concurrency`` httpx clients for ``--duration`` seconds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+ENDPOINTS = [
+    ("/api/telemetry/events", {"limit": 50}),
+    ("/api/telemetry/events", {"limit": 50, "severity": "High"}),
+    ("/api/tickets/top-categories", {}),
+    ("/api/tickets/sentiment-summary", {}),
+]
+
+
+def seed(database_url: str, events: int) -> None:
+    """Seed in a child process so this process never imports the app's settings."""
+    script = (
+        "import sys; from benchmarks.telemetry_read_path import seed; seed(int(sys.argv[1]))"
+    )
+    env = {**os.environ, "DATABASE_URL": database_url}
+    subprocess.run([sys.executable, "-c", script, str(events)], env=env, check=True)
+
+
+async def drive(base_url: str, concurrency: int, duration: float) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+
+        async def worker(offset: int) -> None:
+            nonlocal errors
+            index = offset
+            while time.perf_counter() < deadline:
+                path, params = ENDPOINTS[index % len(ENDPOINTS)]
+                index += 1
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path, params=params)
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0.0,
+    }
+
+
+def wait_until_healthy(base_url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"API at {base_url} did not become healthy")
+
+
+def run_mode(mode: str, database_url: str, args: argparse.Namespace) -> Dict[str, float]:
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "API_ASYNC_DB": "true" if mode == "async" else "false",
+        "API_CACHE_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+    }
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "api.main:app",
+            "--port",
+            str(args.port),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        env=env,
+    )
+    try:
+        wait_until_healthy(base_url)
+        asyncio.run(drive(base_url, args.concurrency, min(args.duration, 2)))  # warm-up
+        return asyncio.run(drive(base_url, args.concurrency, args.duration))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per mode")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="api-load-bench-"))
+    database_url = f"sqlite:///{(workdir / 'bench.db').as_posix()}"
+    seed(database_url, args.events)
+    print(
+        f"events={args.events:,} concurrency={args.concurrency} duration={args.duration:.0f}s"
+    )
+    for mode in ("sync", "async"):
+        stats = run_mode(mode, database_url, args)
+        print(
+            f"{mode:<6} {stats['rps']:9,.1f} req/s  p50={stats['p50_ms']:7.1f}ms "
+            f"p95={stats['p95_ms']:7.1f}ms  requests={stats['requests']:,} "
+            f"errors={stats['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
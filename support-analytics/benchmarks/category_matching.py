@@ -0,0 +1,106 @@
+"""Benchmark rule-loop vs. compiled category matching at scale.
+
+Builds a synthetic rule set with a few hundred categories and categorizes a
+large Series of descriptions. The legacy loop is timed on a sample and
+extrapolated, because running it over millions of rows takes minutes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import time
+from typing import Dict, List
+
+import pandas as pd
+
+from etl.nlp_model import CategoryMatcher
+
+
+def build_rules(category_count: int, keywords_per_category: int, seed: int) -> Dict[str, List[str]]:
+    rng = random.Random(seed)
+    rules: Dict[str, List[str]] = {}
+    for idx in range(category_count):
+        rules[f"Category {idx:03d}"] = [
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+            for _ in range(keywords_per_category)
+        ]
+    rules["Other"] = []
+    return rules
+
+
+def build_descriptions(
+    rules: Dict[str, List[str]],
+    row_count: int,
+    distinct: int,
+    seed: int,
+) -> pd.Series:
+    rng = random.Random(seed)
+    keywords = [kw for kws in rules.values() for kw in kws]
+    filler = ["node", "cluster", "failed", "after", "upgrade", "job", "on", "the", "ticket"]
+    templates = []
+    for _ in range(distinct):
+        words = rng.choices(filler, k=8)
+        if rng.random() < 0.7:
+            words.insert(rng.randint(0, len(words)), rng.choice(keywords))
+        templates.append(" ".join(words))
+    return pd.Series(rng.choices(templates, k=row_count))
+
+
+def legacy_match(text: str, rules: Dict[str, List[str]]) -> str:
+    text_lower = text.lower()
+    for category, keywords in rules.items():
+        if category == "Other":
+            continue
+        if any(keyword in text_lower for keyword in keywords):
+            return category
+    return "Other"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--categories", type=int, default=300)
+    parser.add_argument("--keywords", type=int, default=5)
+    parser.add_argument("--distinct", type=int, default=50_000, help="distinct descriptions")
+    parser.add_argument("--legacy-sample", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    rules = build_rules(args.categories, args.keywords, args.seed)
+    texts = build_descriptions(rules, args.rows, args.distinct, args.seed)
+    print(
+        f"rules={args.categories}x{args.keywords} rows={args.rows:,} distinct={args.distinct:,}"
+    )
+
+    started = time.perf_counter()
+    matcher = CategoryMatcher(rules)
+    print(f"{'compile':<22} {time.perf_counter() - started:8.3f}s")
+
+    sample = texts.iloc[: args.legacy_sample]
+    started = time.perf_counter()
+    legacy = [legacy_match(text, rules) for text in sample]
+    legacy_rate = len(sample) / (time.perf_counter() - started)
+    print(
+        f"{'legacy loop (est.)':<22} {args.rows / legacy_rate:8.2f}s  {legacy_rate:12,.0f} rows/sec"
+    )
+
+    started = time.perf_counter()
+    per_row = [matcher.match(text) for text in sample]
+    row_rate = len(sample) / (time.perf_counter() - started)
+    print(
+        f"{'compiled per-row (est.)':<22} {args.rows / row_rate:8.2f}s  {row_rate:12,.0f} rows/sec"
+    )
+
+    started = time.perf_counter()
+    vectorized = matcher.match_series(texts)
+    elapsed = time.perf_counter() - started
+    print(f"{'compiled series':<22} {elapsed:8.2f}s  {args.rows / elapsed:12,.0f} rows/sec")
+
+    assert legacy == per_row == vectorized.iloc[: args.legacy_sample].tolist()
+    print("parity with legacy loop: ok")
+
+
+if __name__ == "__main__":
+    main()
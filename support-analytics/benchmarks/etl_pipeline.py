@@ -0,0 +1,263 @@
+"""Time each stage of the ticket and telemetry pipelines and compare to a baseline.
+
+Every (pipeline, size) run happens in a fresh subprocess against its own
+temporary SQLite DB and data directory, so peak RSS is per run and runs do not
+share caches. Stages mirror ``run_ticket_pipeline`` / ``run_telemetry_pipeline``:
+load CSV, enrich, persist, DB load and (tickets) ``refresh_summary``.
+
+Results go to ``--output`` as JSON and are compared against the committed
+baseline; a stage whose throughput drops, or a run whose peak RSS grows, by more
+than ``--tolerance`` is reported as a regression. Peak RSS is only tracked per
+run: ``ru_maxrss`` never goes down, so a per-stage reading would carry the
+peak of every earlier stage. Sentiment defaults to the
+heuristic backend so the numbers track the pipeline rather than the model;
+``benchmarks.sentiment_backends`` covers model throughput.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+BASELINE_PATH = BENCHMARK_DIR / "baselines" / "etl_pipeline.json"
+RESULTS_PATH = BENCHMARK_DIR / "results" / "etl_pipeline.json"
+PIPELINES = ("tickets", "telemetry")
+# Stages faster than this in both runs swing by tens of percent between runs.
+MIN_STAGE_SECONDS = 1.0
+
+
+def peak_rss_mib() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+class StageTimer:
+    def __init__(self, rows: int) -> None:
+        self.rows = rows
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - started
+        self.stages[name] = {
+            "seconds": round(seconds, 4),
+            "rows_per_sec": round(self.rows / seconds, 1) if seconds else None,
+        }
+
+
+def run_tickets(rows: int) -> StageTimer:
+    from config import get_settings
+    from database.init_db import create_schema, load_tickets, refresh_summary
+    from etl.ticket_etl import (
+        build_nlp_cache,
+        build_nlp_processor,
+        enrich_with_features,
+        generate_raw_tickets,
+        load_ticket_csv,
+        persist_processed,
+    )
+
+    generate_raw_tickets(rows)
+    create_schema()
+    cache = build_nlp_cache()
+    nlp = build_nlp_processor(cache=cache).warm_up()
+
+    timer = StageTimer(rows)
+    with timer.stage("load_csv"):
+        df = load_ticket_csv(get_settings().ticket_raw_path)
+    with timer.stage("enrich"):
+        df = enrich_with_features(df, nlp)
+    cache.close()
+    with timer.stage("persist"):
+        persist_processed(df)
+    with timer.stage("db_load"):
+        load_tickets(df)
+    with timer.stage("refresh_summary"):
+        refresh_summary()
+    return timer
+
+
+def run_telemetry(rows: int) -> StageTimer:
+    import pandas as pd
+
+    from config import get_settings
+    from database.init_db import create_schema, load_telemetry
+    from etl.telemetry_etl import enrich_telemetry, generate_raw_telemetry, persist_processed
+
+    generate_raw_telemetry(rows)
+    create_schema()
+
+    timer = StageTimer(rows)
+    with timer.stage("load_csv"):
+        df = pd.read_csv(get_settings().telemetry_raw_path)
+    with timer.stage("enrich"):
+        df = enrich_telemetry(df)
+    with timer.stage("persist"):
+        persist_processed(df)
+    with timer.stage("db_load"):
+        load_telemetry(df)
+    return timer
+
+
+def run_child(pipeline: str, rows: int) -> None:
+    """Entry point inside the subprocess: run one pipeline and print its JSON."""
+    timer = (run_tickets if pipeline == "tickets" else run_telemetry)(rows)
+    print(
+        json.dumps(
+            {
+                "pipeline": pipeline,
+                "rows": rows,
+                "total_seconds": round(sum(s["seconds"] for s in timer.stages.values()), 4),
+                "peak_rss_mib": round(peak_rss_mib(), 1),
+                "stages": timer.stages,
+            }
+        )
+    )
+
+
+def run_isolated(pipeline: str, rows: int, sentiment_backend: str) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix=f"etl-bench-{pipeline}-{rows}-"))
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{(workdir / 'bench.db').as_posix()}",
+        "TICKET_RAW_PATH": str(workdir / "raw_tickets.csv"),
+        "TELEMETRY_RAW_PATH": str(workdir / "raw_telemetry.csv"),
+        "PROCESSED_DIR": str(workdir / "processed"),
+        "SENTIMENT_BACKEND": sentiment_backend,
+        "NLP_CACHE_PERSIST": "false",
+    }
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.etl_pipeline", "--child", pipeline, str(rows)],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        sys.stderr.write(completed.stderr)
+        raise RuntimeError(f"{pipeline} benchmark at {rows:,} rows failed")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_key(run: dict) -> str:
+    return f"{run['pipeline']}@{run['rows']}"
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Print per-stage throughput and per-run peak RSS vs. ``baseline``.
+
+    Returns the regressions found.
+    """
+    baseline_runs = {run_key(run): run for run in baseline["runs"]}
+    regressions: List[str] = []
+    print(f"\n{'run':<18} {'stage':<16} {'baseline':>12} {'current':>12} {'change':>8}")
+    for run in results["runs"]:
+        previous = baseline_runs.get(run_key(run))
+        if previous is None:
+            print(f"{run_key(run):<18} (no baseline)")
+            continue
+        rss_change = run["peak_rss_mib"] / previous["peak_rss_mib"] - 1
+        flag = ""
+        if rss_change > tolerance:
+            flag = "  MORE MEMORY"
+            regressions.append(f"{run_key(run)}: peak RSS {rss_change:+.0%}")
+        print(
+            f"{run_key(run):<18} {'peak RSS':<16} {previous['peak_rss_mib']:>8,.0f} MiB "
+            f"{run['peak_rss_mib']:>8,.0f} MiB {rss_change:>+8.0%}{flag}"
+        )
+        for name, stage in run["stages"].items():
+            before = previous["stages"].get(name)
+            if before is None or not before["rows_per_sec"] or not stage["rows_per_sec"]:
+                continue
+            change = stage["rows_per_sec"] / before["rows_per_sec"] - 1
+            noisy = max(stage["seconds"], before["seconds"]) < MIN_STAGE_SECONDS
+            flag = ""
+            if not noisy and change < -tolerance:
+                flag = "  SLOWER"
+                regressions.append(f"{run_key(run)} {name}: throughput {change:+.0%}")
+            print(
+                f"{run_key(run):<18} {name:<16} {before['rows_per_sec']:>10,.0f}/s "
+                f"{stage['rows_per_sec']:>10,.0f}/s {change:>+8.0%}{flag}"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--pipelines", nargs="+", choices=PIPELINES, default=list(PIPELINES))
+    parser.add_argument("--sentiment-backend", default="heuristic")
+    parser.add_argument("--output", type=Path, default=RESULTS_PATH)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="fractional throughput drop / RSS growth treated as a regression",
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--child", nargs=2, metavar=("PIPELINE", "ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], int(args.child[1]))
+        return
+
+    results = {
+        "environment": {
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sentiment_backend": args.sentiment_backend,
+        },
+        "runs": [],
+    }
+    for rows in sorted(args.sizes):
+        for pipeline in args.pipelines:
+            run = run_isolated(pipeline, rows, args.sentiment_backend)
+            results["runs"].append(run)
+            print(
+                f"{run_key(run):<18} total {run['total_seconds']:8.2f}s  "
+                f"peak RSS {run['peak_rss_mib']:7.1f} MiB  "
+                + "  ".join(
+                    f"{name} {stage['seconds']:.2f}s" for name, stage in run["stages"].items()
+                )
+            )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"results written to {args.output}")
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline updated at {args.baseline}")
+        return
+
+    regressions: Optional[List[str]] = None
+    if args.baseline.exists():
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+    else:
+        print(f"no baseline at {args.baseline}; run with --update-baseline to record one")
+    if regressions:
+        print("\nregressions vs. baseline:\n  " + "\n  ".join(regressions))
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Measure sentiment enrichment throughput as NLP worker processes are added.
+
+Worker start-up (spawning the interpreter and loading the model once per
+worker) is reported separately from steady-state scoring time, since the
+pipeline pays it once per run rather than once per chunk.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from benchmarks.sentiment_batching import build_texts
+from config import get_settings
+from etl.ticket_etl import build_nlp_processor, build_sentiment_scorer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    texts = build_texts(args.records)
+    print(
+        f"model={settings.huggingface_model} backend={settings.sentiment_backend} "
+        f"records={args.records:,}"
+    )
+
+    baseline = None
+    expected = None
+    for workers in args.workers:
+        started = time.perf_counter()
+        scorer = build_sentiment_scorer(workers)
+        nlp = build_nlp_processor(scorer=scorer)
+        if scorer is not None:
+            scorer.score(texts[: workers * 2], batch_size=1)  # wait for every worker to load
+        startup = time.perf_counter() - started
+        try:
+            started = time.perf_counter()
+            results = nlp.analyze_sentiment_batch(texts, batch_size=args.batch_size)
+            elapsed = time.perf_counter() - started
+        finally:
+            if scorer is not None:
+                scorer.close()
+        expected = expected or results
+        assert results == expected, f"{workers} workers changed sentiment results"
+        rate = args.records / elapsed
+        baseline = baseline or rate
+        print(
+            f"workers={workers:<3} startup {startup:6.2f}s  scoring {elapsed:8.2f}s "
+            f"{rate:10.1f} tickets/sec  x{rate / baseline:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Compare CSV and Parquet for the processed telemetry dataset.
+
+Builds an enriched telemetry frame shaped like ``telemetry_processed`` with
+numpy, then times ``write_processed`` / ``load_processed`` for each format
+(full read and a column-projected read like ``initialize_database``) and
+reports the size on disk. Files go to a temporary processed_dir. The
+default 10M rows peak at about 5.5 GiB RSS; pass ``--rows`` to go smaller.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def build_frame(rows: int, seed: int = 7) -> pd.DataFrame:
+    from etl.telemetry_etl import EVENT_TYPES, HEALTH_LEVELS, PRODUCTS
+
+    rng = np.random.default_rng(seed)
+    created = pd.Timestamp("2024-01-01") + pd.to_timedelta(
+        np.sort(rng.integers(0, 90 * 24 * 3600, rows)), unit="s"
+    )
+    response = rng.integers(5, 500, rows)
+    return pd.DataFrame(
+        {
+            "event_id": pd.Series(np.arange(rows)).map("EVT-{:09d}".format),
+            "node_id": pd.Series(rng.integers(1, 500, rows)).map("NODE-{:03d}".format),
+            "event_type": pd.Categorical.from_codes(
+                rng.integers(0, len(EVENT_TYPES), rows), categories=EVENT_TYPES
+            ),
+            "response_time_ms": response,
+            "cpu_usage": rng.uniform(5, 99, rows).round(2),
+            "storage_utilization": rng.uniform(10, 95, rows).round(2),
+            "created_at": created,
+            "health_severity": pd.Categorical.from_codes(
+                rng.integers(0, len(HEALTH_LEVELS), rows), categories=HEALTH_LEVELS, ordered=True
+            ),
+            "product": pd.Categorical.from_codes(
+                rng.integers(0, len(PRODUCTS), rows), categories=PRODUCTS
+            ),
+            "response_time_bucket": pd.cut(
+                response,
+                bins=[0, 25, 50, 75, 100, 999],
+                labels=["<25ms", "25-50ms", "50-75ms", "75-100ms", "100ms+"],
+                include_lowest=True,
+            ),
+        }
+    )
+
+
+def size_on_disk(path: Path) -> int:
+    if path.is_dir():
+        return sum(part.stat().st_size for part in path.rglob("*") if part.is_file())
+    return path.stat().st_size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    os.environ["PROCESSED_DIR"] = tempfile.mkdtemp(prefix="processed-format-bench-")
+    from database.init_db import TELEMETRY_COLUMNS
+    from database.processed_store import PROCESSED_FORMATS, load_processed, write_processed
+
+    started = time.perf_counter()
+    frame = build_frame(args.rows)
+    print(f"rows={args.rows:,} (frame built in {time.perf_counter() - started:.1f}s)")
+    projection = [column for column in TELEMETRY_COLUMNS if column != "node_id"]
+
+    for fmt in PROCESSED_FORMATS:
+        started = time.perf_counter()
+        path = write_processed(frame, "telemetry_processed.csv", fmt=fmt)
+        write_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        loaded = load_processed("telemetry_processed.csv", fmt=fmt)
+        read_seconds = time.perf_counter() - started
+        assert len(loaded) == args.rows
+        del loaded
+
+        started = time.perf_counter()
+        load_processed("telemetry_processed.csv", columns=projection, fmt=fmt)
+        projected_seconds = time.perf_counter() - started
+        print(
+            f"{fmt:<8} write {write_seconds:7.2f}s  read {read_seconds:7.2f}s  "
+            f"projected read {projected_seconds:7.2f}s  size {size_on_disk(path) / 2**20:9.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Compare sentiment backends on throughput and label parity with fp32 torch.
+
+Every backend scores the same synthetic tickets. Agreement is measured
+against the fp32 ``torch`` labels, so ``torch`` always runs first as the
+reference. Checking any model backend without a loaded fp32 reference is a
+failure, not a pass. Other backends whose dependencies or model files are
+missing are reported as unavailable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+from benchmarks.sentiment_batching import build_texts
+from config import get_settings
+from etl.nlp_model import SENTIMENT_BACKENDS, TicketNLPProcessor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--backends", nargs="+", default=list(SENTIMENT_BACKENDS))
+    parser.add_argument(
+        "--min-agreement",
+        type=float,
+        default=0.99,
+        help="exit non-zero if a model backend agrees with fp32 labels less often than this",
+    )
+    args = parser.parse_args()
+
+    settings = get_settings()
+    texts = build_texts(args.records)
+    print(
+        f"model={settings.huggingface_model} onnx_dir={settings.onnx_model_dir} "
+        f"records={args.records:,}"
+    )
+
+    reference = None
+    failed = False
+    checked_models = []
+    # torch first: it is the reference every other backend is compared to.
+    for backend in sorted(args.backends, key=lambda name: name != "torch"):
+        nlp = TicketNLPProcessor(
+            settings.huggingface_model,
+            backend=backend,
+            onnx_model_dir=settings.onnx_model_dir,
+        )
+        started = time.perf_counter()
+        try:
+            nlp.warm_up()
+        except FileNotFoundError as exc:
+            print(f"{backend:<11} unavailable ({exc})")
+            continue
+        load_seconds = time.perf_counter() - started
+        if not nlp.sentiment_available:
+            print(f"{backend:<11} unavailable")
+            continue
+        started = time.perf_counter()
+        labels = [result.label for result in nlp.analyze_sentiment_batch(texts, args.batch_size)]
+        elapsed = time.perf_counter() - started
+        if backend == "torch":
+            reference = labels
+        if backend != "heuristic":
+            checked_models.append(backend)
+        agreement = (
+            sum(a == b for a, b in zip(labels, reference)) / len(labels)
+            if reference is not None
+            else None
+        )
+        parity = f"{agreement:8.2%}" if agreement is not None else "     n/a"
+        print(
+            f"{backend:<11} load {load_seconds:6.2f}s  {args.records / elapsed:10.1f} tickets/sec"
+            f"  fp32 label agreement {parity}"
+        )
+        if backend != "heuristic" and agreement is not None and agreement < args.min_agreement:
+            failed = True
+    if checked_models and reference is None:
+        sys.exit(
+            f"no fp32 torch reference loaded; cannot check label parity of {checked_models}"
+        )
+    if failed:
+        sys.exit(f"a backend fell below {args.min_agreement:.0%} label agreement with fp32")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Benchmark the /api/telemetry/events read path: ORM + pydantic vs. lean Core rows.
+
+Seeds a throwaway SQLite database, then requests ``limit`` events through
+both a replica of the original ORM/pydantic handler and the current endpoint
+(with the response cache bypassed). Latency is measured without tracing;
+allocations are measured in a separate tracemalloc pass.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from sqlalchemy.orm import Session
+
+
+def seed(event_count: int) -> None:
+    import numpy as np
+    import pandas as pd
+
+    from database.init_db import create_schema, load_telemetry
+
+    rng = np.random.default_rng(7)
+    created = pd.Timestamp.utcnow().tz_localize(None) - pd.to_timedelta(
+        rng.integers(0, 7 * 24 * 3600, event_count), unit="s"
+    )
+    create_schema()
+    load_telemetry(
+        pd.DataFrame(
+            {
+                "event_id": [f"EVT-{idx:07d}" for idx in range(event_count)],
+                "node_id": [f"NODE-{idx % 50:03d}" for idx in range(event_count)],
+                "product": rng.choice(["Cohesity DataProtect", "Cohesity FortKnox"], event_count),
+                "event_type": rng.choice(["CPU Spike", "Latency Spike", "Heartbeat"], event_count),
+                "response_time_ms": rng.integers(5, 500, event_count),
+                "cpu_usage": rng.uniform(5, 99, event_count).round(2),
+                "storage_utilization": rng.uniform(10, 95, event_count).round(2),
+                "health_severity": rng.choice(["Normal", "Elevated", "High"], event_count),
+                "response_time_bucket": "25-50ms",
+                "created_at": created.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+        )
+    )
+
+
+def legacy_app():
+    """The handler as it was before the lean read path, mounted on a bare app."""
+    from fastapi import Depends, FastAPI, Query
+    from sqlalchemy import select
+
+    from api import schemas
+    from database.models import TelemetryEvent
+    from database.session import get_session
+
+    app = FastAPI()
+
+    @app.get("/api/telemetry/events", response_model=List[schemas.TelemetryEventResponse])
+    def telemetry_events(
+        limit: int = Query(default=200, ge=1),
+        product: Optional[str] = Query(default=None),
+        session: Session = Depends(get_session),
+    ):
+        stmt = select(TelemetryEvent).order_by(TelemetryEvent.created_at.desc()).limit(limit)
+        if product:
+            stmt = stmt.where(TelemetryEvent.product == product)
+        rows = session.execute(stmt).scalars().all()
+        return [
+            schemas.TelemetryEventResponse(
+                event_id=row.event_id,
+                node_id=row.node_id,
+                product=row.product,
+                event_type=row.event_type,
+                response_time_ms=row.response_time_ms,
+                cpu_usage=row.cpu_usage,
+                storage_utilization=row.storage_utilization,
+                health_severity=row.health_severity,
+                response_time_bucket=row.response_time_bucket,
+                created_at=row.created_at,
+            )
+            for row in rows
+        ]
+
+    return app
+
+
+def measure(label: str, request: Callable[[], object], iterations: int) -> None:
+    request()  # warm connection pool and route compilation
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        request()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    request()
+    snapshot_after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = snapshot_after.compare_to(snapshot_before, "filename")
+    allocated = sum(stat.size_diff for stat in stats if stat.size_diff > 0)
+    blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+    print(
+        f"{label:<18} p50={statistics.median(timings) * 1000:7.2f}ms "
+        f"p95={sorted(timings)[int(len(timings) * 0.95) - 1] * 1000:7.2f}ms "
+        f"peak={peak / 1024:8.0f}KiB retained={allocated / 1024:6.0f}KiB blocks={blocks:,}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="telemetry-read-bench-"))
+    os.environ["DATABASE_URL"] = f"sqlite:///{(workdir / 'bench.db').as_posix()}"
+    os.environ["API_CACHE_ENABLED"] = "false"
+
+    from fastapi.testclient import TestClient
+
+    from api.main import create_app
+
+    seed(args.events)
+    params = {"limit": args.limit}
+    print(f"events={args.events:,} limit={args.limit} iterations={args.iterations}")
+
+    with TestClient(legacy_app()) as legacy, TestClient(create_app()) as lean:
+        legacy_body = legacy.get("/api/telemetry/events", params=params).json()
+        lean_body = lean.get("/api/telemetry/events", params=params).json()
+        assert legacy_body == lean_body, "lean read path changed the response body"
+        for label, client in (("orm + pydantic", legacy), ("core rows + orjson", lean)):
+            measure(
+                label,
+                lambda: client.get("/api/telemetry/events", params=params),
+                args.iterations,
+            )
+    print("response parity: ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,10 +35,63 @@ class Settings:
             PROCESSED_DIR.as_posix(),
         )
     )
+    # csv | parquet (partitioned part files; needs pyarrow)
+    processed_format: str = os.getenv("PROCESSED_FORMAT", "csv")
     huggingface_model: str = os.getenv(
         "HUGGINGFACE_MODEL",
         "distilbert-base-uncased-finetuned-sst-2-english",
     )
+    # torch | torch-int8 | onnx | heuristic
+    sentiment_backend: str = os.getenv("SENTIMENT_BACKEND", "torch")
+    onnx_model_dir: Path = Path(
+        os.getenv(
+            "ONNX_MODEL_DIR",
+            (DATA_DIR / "models" / "sentiment-onnx").as_posix(),
+        )
+    )
+    sentiment_batch_size: int = int(os.getenv("SENTIMENT_BATCH_SIZE", "32"))
+    nlp_cache_size: int = int(os.getenv("NLP_CACHE_SIZE", "50000"))
+    nlp_cache_persist: bool = os.getenv("NLP_CACHE_PERSIST", "false").lower() in {
+        "1",
+        "true",
+        "yes",
+    }
+    nlp_workers: int = int(os.getenv("NLP_WORKERS", "1"))
+    # 0 splits the host's cores evenly across NLP workers.
+    nlp_torch_threads: int = int(os.getenv("NLP_TORCH_THREADS", "0"))
+    db_chunk_size: int = int(os.getenv("DB_CHUNK_SIZE", "5000"))
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in {
+        "1",
+        "true",
+        "yes",
+    }
+    db_pool_recycle_seconds: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    sqlite_cache_size_kib: int = int(os.getenv("SQLITE_CACHE_SIZE_KIB", "65536"))
+    sqlite_mmap_size_bytes: int = int(os.getenv("SQLITE_MMAP_SIZE_BYTES", "268435456"))
+    api_async_db: bool = os.getenv("API_ASYNC_DB", "false").lower() in {
+        "1",
+        "true",
+        "yes",
+    }
+    api_cache_enabled: bool = os.getenv("API_CACHE_ENABLED", "true").lower() in {
+        "1",
+        "true",
+        "yes",
+    }
+    api_metrics_enabled: bool = os.getenv("API_METRICS_ENABLED", "true").lower() in {
+        "1",
+        "true",
+        "yes",
+    }
+    api_cache_ttl_seconds: float = float(os.getenv("API_CACHE_TTL_SECONDS", "60"))
+    api_cache_max_entries: int = int(os.getenv("API_CACHE_MAX_ENTRIES", "512"))
+    api_cache_version_poll_seconds: float = float(
+        os.getenv("API_CACHE_VERSION_POLL_SECONDS", "1.0")
+    )
+    telemetry_max_page_size: int = int(os.getenv("TELEMETRY_MAX_PAGE_SIZE", "10000"))
     trend_window_days: int = int(os.getenv("TREND_WINDOW_DAYS", "30"))
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
 
@@ -0,0 +1,66 @@
+"""AsyncEngine/AsyncSession counterparts of ``database.session`` for the async API.
+
+Imported only when ``API_ASYNC_DB`` is enabled, so aiosqlite/asyncpg stay
+optional for the ETL jobs and the default sync API.
+"""
+
+from __future__ import annotations
+
+from typing import AsyncIterator
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from config import Settings, get_settings
+from database.session import _apply_sqlite_pragmas, _is_memory_sqlite
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_database_url(database_url: str) -> str:
+    """Swap the configured sync driver for its asyncio equivalent."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend {backend!r}")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def build_async_engine(settings: Settings) -> AsyncEngine:
+    url = make_url(async_database_url(settings.database_url))
+    options = {"pool_pre_ping": settings.db_pool_pre_ping}
+    is_sqlite = url.get_backend_name() == "sqlite"
+    in_memory = is_sqlite and _is_memory_sqlite(url.database)
+    if not in_memory:
+        options.update(
+            # aiosqlite defaults to NullPool, which would reopen the file per request.
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_recycle=settings.db_pool_recycle_seconds,
+        )
+    engine = create_async_engine(url, **options)
+    if is_sqlite:
+        _apply_sqlite_pragmas(engine.sync_engine, settings, in_memory)
+    return engine
+
+
+settings = get_settings()
+
+async_engine = build_async_engine(settings)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency."""
+    async with AsyncSessionLocal() as session:
+        yield session
@@ -1,115 +1,694 @@
 from __future__ import annotations
 
 import argparse
+import time
 from pathlib import Path
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 from loguru import logger
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    MetaData,
+    String,
+    Table,
+    and_,
+    case,
+    cast,
+    func,
+    inspect,
+    or_,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.engine import Connection
 
 from config import get_settings
 from database import models
+from database.processed_store import load_processed
+from database.rollups import GROUP_KEY, ROLLUP_SOURCE_COLUMNS, aggregate_hourly
 from database.session import SessionLocal, Base, engine
 
 
 def create_schema() -> None:
     logger.info("Creating database schema if missing")
+    summary_rebuilt = _drop_if_columns_changed(models.TicketSummary.__table__)
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so indexes added to the models
+    # later would never reach databases created before them.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    if summary_rebuilt:
+        refresh_summary()
 
 
-def load_csv(path: Path) -> pd.DataFrame:
-    if not path.exists():
-        raise FileNotFoundError(f"Expected processed file missing: {path}")
-    return pd.read_csv(path)
+def _drop_if_columns_changed(table: Table) -> bool:
+    """Drop a derived table whose columns no longer match its model.
 
+    create_all never alters existing tables; derived tables are cheaper to
+    drop, recreate and refresh than to migrate.
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(table.name):
+        return False
+    existing = {column["name"] for column in inspector.get_columns(table.name)}
+    if existing == set(table.columns.keys()):
+        return False
+    logger.warning("Rebuilding {}: its columns differ from the model", table.name)
+    table.drop(bind=engine)
+    return True
 
-def load_tickets(df: pd.DataFrame) -> None:
+
+TICKET_COLUMNS = [
+    "ticket_id",
+    "customer_id",
+    "product",
+    "issue_description",
+    "severity",
+    "status",
+    "created_at",
+    "resolved_at",
+    "resolution_hours",
+    "severity_score",
+]
+TICKET_NLP_COLUMNS = ["ticket_id", "predicted_category", "sentiment_label", "sentiment_score"]
+TELEMETRY_COLUMNS = [
+    "event_id",
+    "node_id",
+    "product",
+    "event_type",
+    "response_time_ms",
+    "cpu_usage",
+    "storage_utilization",
+    "health_severity",
+    "response_time_bucket",
+    "created_at",
+]
+
+# (table, conflict key, columns) in the order they must be written per chunk.
+UpsertPlan = List[Tuple[Table, str, List[str]]]
+
+# Bound IN (...) lists well below SQLite's host parameter limit.
+LOOKUP_BATCH_SIZE = 500
+
+SUMMARY_SENTIMENT_COLUMNS = {
+    "positive": "positive_count",
+    "negative": "negative_count",
+    "neutral": "neutral_count",
+}
+SUMMARY_ADDITIVE_COLUMNS = [
+    "ticket_count",
+    "total_resolution_hours",
+    *SUMMARY_SENTIMENT_COLUMNS.values(),
+]
+
+
+def load_tickets(df: pd.DataFrame, chunk_size: Optional[int] = None) -> int:
+    """Upsert tickets + NLP rows; returns the number of rows inserted or changed.
+
+    ticket_summary is kept current in the same transaction as each chunk by
+    applying the chunk's per-category deltas. A summary that has never been
+    built (or a dialect without upsert support) falls back to refresh_summary.
+    """
     df["created_at"] = pd.to_datetime(df["created_at"])
     df["resolved_at"] = pd.to_datetime(df["resolved_at"], errors="coerce")
+    plan: UpsertPlan = [
+        (models.Ticket.__table__, "ticket_id", TICKET_COLUMNS),
+        (models.TicketNLP.__table__, "ticket_id", TICKET_NLP_COLUMNS),
+    ]
+    if not _supports_upsert():
+        _merge_tickets(df, chunk_size)
+        refresh_summary()
+        return len(df)
+    if not _summary_in_sync():
+        changed = _bulk_upsert(df, plan, chunk_size, label="ticket")
+        refresh_summary()
+        return changed
+    changed = _bulk_upsert(
+        df, plan, chunk_size, label="ticket", before_chunk=_apply_summary_delta
+    )
+    if changed:
+        bump_data_version("tickets")
+    return changed
+
+
+def load_telemetry(df: pd.DataFrame, chunk_size: Optional[int] = None) -> int:
+    """Upsert telemetry events; returns the number of rows inserted or changed.
+
+    telemetry_hourly_rollups is kept current in the same transaction as each
+    chunk by recomputing the (product, node, hour) groups whose events the
+    chunk adds, changes or moves out of. Until rollups exist (first load),
+    they are built in one refresh_rollups pass after the upsert instead.
+    """
+    df["created_at"] = pd.to_datetime(df["created_at"])
+    plan: UpsertPlan = [(models.TelemetryEvent.__table__, "event_id", TELEMETRY_COLUMNS)]
+    if not _supports_upsert():
+        _merge_telemetry(df, chunk_size)
+        refresh_rollups()
+        return len(df)
+    if not _rollups_built():
+        changed = _bulk_upsert(df, plan, chunk_size, label="telemetry")
+        refresh_rollups()
+        return changed
+    changed = _bulk_upsert(
+        df,
+        plan,
+        chunk_size,
+        label="telemetry",
+        before_chunk=_touched_rollup_groups,
+        after_chunk=_refresh_rollup_groups,
+    )
+    if changed:
+        bump_data_version("telemetry")
+    return changed
+
+
+def _supports_upsert() -> bool:
+    return engine.dialect.name in {"sqlite", "postgresql"}
+
+
+def _upsert_statement(table: Table, keys: Sequence[str], columns: List[str]):
+    """INSERT ... ON CONFLICT (keys) DO UPDATE, matching session.merge semantics."""
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = insert(table)
+    update_columns = [column for column in columns if column not in keys]
+    return stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={column: stmt.excluded[column] for column in update_columns},
+        # Leave identical rows untouched so reloads only write what changed.
+        where=or_(
+            *[table.c[column].is_distinct_from(stmt.excluded[column]) for column in update_columns]
+        ),
+    )
+
+
+def _bulk_upsert(
+    df: pd.DataFrame,
+    plan: UpsertPlan,
+    chunk_size: Optional[int],
+    label: str,
+    before_chunk: Optional[Callable[[Connection, pd.DataFrame], Any]] = None,
+    after_chunk: Optional[Callable[[Connection, pd.DataFrame, Any], None]] = None,
+) -> int:
+    """Upsert ``df`` chunk by chunk, one transaction per chunk.
+
+    Repeated conflict keys within a chunk collapse to their last row.
+
+    ``before_chunk`` runs ahead of the chunk's upserts and whatever it returns is
+    handed to ``after_chunk``, which only runs when the chunk changed rows.
+    """
+    chunk_size = chunk_size or get_settings().db_chunk_size
+    statements = [
+        (_upsert_statement(table, [key], columns), columns) for table, key, columns in plan
+    ]
+    started = time.perf_counter()
+    changed = 0
+    keys = list(dict.fromkeys(key for _, key, _ in plan))
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start : start + chunk_size]
+        # A multi-row ON CONFLICT DO UPDATE may not touch the same row twice
+        # (PostgreSQL rejects it), so the last occurrence of a key wins, as
+        # with the per-row merge.
+        for key in keys:
+            chunk = chunk.drop_duplicates(key, keep="last")
+        with engine.begin() as connection:
+            state = before_chunk(connection, chunk) if before_chunk is not None else None
+            chunk_changed = 0
+            for stmt, columns in statements:
+                result = connection.execute(stmt, _records(chunk, columns))
+                chunk_changed += max(result.rowcount, 0)
+            if after_chunk is not None and chunk_changed:
+                after_chunk(connection, chunk, state)
+            changed += chunk_changed
+    elapsed = time.perf_counter() - started
+    rate = len(df) / elapsed if elapsed else float("inf")
+    logger.success(
+        "Loaded {} {} rows into DB in {:.2f}s ({:,.0f} rows/sec, chunk size {}, {} rows written)",
+        len(df),
+        label,
+        elapsed,
+        rate,
+        chunk_size,
+        changed,
+    )
+    return changed
+
+
+def _records(df: pd.DataFrame, columns: List[str]) -> List[dict]:
+    """Convert a frame to DB-API friendly dicts (native Python types, NaN/NaT -> None)."""
+    values = []
+    for column in columns:
+        series = df[column]
+        array = series.astype(object).to_numpy(dtype=object, copy=True)
+        array[series.isna().to_numpy()] = None
+        values.append(array)
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def _existing_ids(session, model, key: str, values: List[str]) -> dict:
+    column = getattr(model, key)
+    return dict(session.execute(select(column, model.id).where(column.in_(values))).all())
+
+
+def _merge_tickets(df: pd.DataFrame, chunk_size: Optional[int] = None) -> None:
+    """Portable fallback: session.merge keyed on the surrogate ids of existing rows."""
+    chunk_size = chunk_size or get_settings().db_chunk_size
     with SessionLocal() as session:
-        for record in df.to_dict(orient="records"):
-            ticket = models.Ticket(
-                ticket_id=record["ticket_id"],
-                customer_id=record["customer_id"],
-                product=record["product"],
-                issue_description=record["issue_description"],
-                severity=record["severity"],
-                status=record["status"],
-                created_at=record["created_at"],
-                resolved_at=record["resolved_at"],
-                resolution_hours=record["resolution_hours"],
-                severity_score=record["severity_score"],
-            )
-            nlp = models.TicketNLP(
-                ticket_id=record["ticket_id"],
-                predicted_category=record["predicted_category"],
-                sentiment_label=record["sentiment_label"],
-                sentiment_score=record["sentiment_score"],
+        for start in range(0, len(df), chunk_size):
+            records = _records(
+                df.iloc[start : start + chunk_size],
+                TICKET_COLUMNS + TICKET_NLP_COLUMNS[1:],
             )
-            session.merge(ticket)
-            session.merge(nlp)
-        session.commit()
-        logger.success("Loaded %s ticket rows into DB", len(df))
+            keys = [record["ticket_id"] for record in records]
+            ticket_ids = _existing_ids(session, models.Ticket, "ticket_id", keys)
+            nlp_ids = _existing_ids(session, models.TicketNLP, "ticket_id", keys)
+            for record in records:
+                key = record["ticket_id"]
+                session.merge(
+                    models.Ticket(
+                        id=ticket_ids.get(key),
+                        **{column: record[column] for column in TICKET_COLUMNS},
+                    )
+                )
+                session.merge(
+                    models.TicketNLP(
+                        id=nlp_ids.get(key),
+                        **{column: record[column] for column in TICKET_NLP_COLUMNS},
+                    )
+                )
+            session.commit()
+        logger.success("Loaded {} ticket rows into DB", len(df))
 
 
-def load_telemetry(df: pd.DataFrame) -> None:
-    df["created_at"] = pd.to_datetime(df["created_at"])
+def _merge_telemetry(df: pd.DataFrame, chunk_size: Optional[int] = None) -> None:
+    chunk_size = chunk_size or get_settings().db_chunk_size
     with SessionLocal() as session:
-        for record in df.to_dict(orient="records"):
-            telemetry = models.TelemetryEvent(
-                event_id=record["event_id"],
-                node_id=record["node_id"],
-                product=record["product"],
-                event_type=record["event_type"],
-                response_time_ms=record["response_time_ms"],
-                cpu_usage=record["cpu_usage"],
-                storage_utilization=record["storage_utilization"],
-                health_severity=record["health_severity"],
-                response_time_bucket=record["response_time_bucket"],
-                created_at=record["created_at"],
+        for start in range(0, len(df), chunk_size):
+            records = _records(df.iloc[start : start + chunk_size], TELEMETRY_COLUMNS)
+            event_ids = _existing_ids(
+                session,
+                models.TelemetryEvent,
+                "event_id",
+                [record["event_id"] for record in records],
             )
-            session.merge(telemetry)
-        session.commit()
-        logger.success("Loaded %s telemetry rows into DB", len(df))
+            for record in records:
+                session.merge(
+                    models.TelemetryEvent(id=event_ids.get(record["event_id"]), **record)
+                )
+            session.commit()
+        logger.success("Loaded {} telemetry rows into DB", len(df))
 
 
-def refresh_summary() -> None:
+def fetch_row_hashes(pipeline: str, record_ids: Sequence[str]) -> Dict[str, str]:
+    """Return the stored raw-row hash for each known record id of a pipeline."""
+    hashes: Dict[str, str] = {}
+    table = models.EtlRowHash.__table__
+    with engine.connect() as connection:
+        for start in range(0, len(record_ids), LOOKUP_BATCH_SIZE):
+            batch = list(record_ids[start : start + LOOKUP_BATCH_SIZE])
+            rows = connection.execute(
+                select(table.c.record_id, table.c.row_hash).where(
+                    table.c.pipeline == pipeline,
+                    table.c.record_id.in_(batch),
+                )
+            )
+            hashes.update(rows.tuples().all())
+    return hashes
+
+
+def save_row_hashes(pipeline: str, hashes: Dict[str, str]) -> None:
+    if not hashes:
+        return
+    table = models.EtlRowHash.__table__
+    columns = ["pipeline", "record_id", "row_hash"]
+    records = [
+        {"pipeline": pipeline, "record_id": record_id, "row_hash": row_hash}
+        for record_id, row_hash in hashes.items()
+    ]
+    chunk_size = get_settings().db_chunk_size
+    with engine.begin() as connection:
+        if not _supports_upsert():
+            connection.execute(
+                table.delete().where(
+                    table.c.pipeline == pipeline,
+                    table.c.record_id.in_(list(hashes)),
+                )
+            )
+            connection.execute(table.insert(), records)
+            return
+        stmt = _upsert_statement(table, ["pipeline", "record_id"], columns)
+        for start in range(0, len(records), chunk_size):
+            connection.execute(stmt, records[start : start + chunk_size])
+
+
+def get_checkpoint(pipeline: str) -> Optional[models.EtlCheckpoint]:
     with SessionLocal() as session:
-        session.query(models.TicketSummary).delete()
+        return session.execute(
+            select(models.EtlCheckpoint).where(models.EtlCheckpoint.pipeline == pipeline)
+        ).scalar_one_or_none()
+
+
+def save_checkpoint(
+    pipeline: str,
+    source_path: Path,
+    rows_seen: int,
+    rows_processed: int,
+    high_water_mark: Optional[datetime],
+) -> None:
+    with SessionLocal() as session:
+        checkpoint = session.execute(
+            select(models.EtlCheckpoint).where(models.EtlCheckpoint.pipeline == pipeline)
+        ).scalar_one_or_none()
+        if checkpoint is None:
+            checkpoint = models.EtlCheckpoint(pipeline=pipeline)
+            session.add(checkpoint)
+        previous_mark = checkpoint.high_water_mark
+        checkpoint.source_path = str(source_path)
+        checkpoint.source_size_bytes = source_path.stat().st_size if source_path.exists() else 0
+        checkpoint.rows_seen = rows_seen
+        checkpoint.rows_processed = rows_processed
+        if high_water_mark is not None and (
+            previous_mark is None or high_water_mark > previous_mark
+        ):
+            checkpoint.high_water_mark = high_water_mark
+        checkpoint.updated_at = datetime.utcnow()
         session.commit()
-        stmt = """
-            SELECT tnl.predicted_category AS category,
-                   COUNT(*) AS ticket_count,
-                   AVG(t.resolution_hours) AS avg_resolution_hours,
-                   SUM(CASE WHEN tnl.sentiment_label = 'positive' THEN 1 ELSE 0 END)*1.0/COUNT(*) AS positive_percent,
-                   SUM(CASE WHEN tnl.sentiment_label = 'negative' THEN 1 ELSE 0 END)*1.0/COUNT(*) AS negative_percent,
-                   SUM(CASE WHEN tnl.sentiment_label = 'neutral' THEN 1 ELSE 0 END)*1.0/COUNT(*) AS neutral_percent
-            FROM tickets t
-            JOIN ticket_nlp tnl ON t.ticket_id = tnl.ticket_id
-            GROUP BY tnl.predicted_category
-        """
-        result = session.execute(stmt)
-        for row in result:
-            summary = models.TicketSummary(
-                category=row.category,
-                ticket_count=row.ticket_count,
-                avg_resolution_hours=row.avg_resolution_hours or 0,
-                positive_percent=row.positive_percent or 0,
-                negative_percent=row.negative_percent or 0,
-                neutral_percent=row.neutral_percent or 0,
+
+
+def _summary_in_sync() -> bool:
+    """Deltas only make sense on top of a built summary (or an empty tickets table)."""
+    with engine.connect() as connection:
+        has_summary = connection.execute(select(models.TicketSummary.id).limit(1)).first()
+        has_tickets = connection.execute(select(models.Ticket.id).limit(1)).first()
+    return has_summary is not None or has_tickets is None
+
+
+def _summary_contributions(frame: pd.DataFrame, sign: int) -> pd.DataFrame:
+    """Per-row additive summary state, negated when removing a row's old values."""
+    contributions = pd.DataFrame(
+        {
+            "category": frame["category"].to_numpy(),
+            "ticket_count": sign,
+            "total_resolution_hours": sign
+            * pd.to_numeric(frame["resolution_hours"], errors="coerce").fillna(0).to_numpy(),
+        }
+    )
+    for label, column in SUMMARY_SENTIMENT_COLUMNS.items():
+        contributions[column] = sign * (frame["sentiment_label"] == label).to_numpy().astype(int)
+    return contributions
+
+
+def _apply_summary_delta(connection: Connection, chunk: pd.DataFrame) -> None:
+    """Fold a ticket chunk into ticket_summary; must run before the chunk is upserted."""
+    chunk = chunk.drop_duplicates("ticket_id", keep="last")
+    ticket_ids = chunk["ticket_id"].astype(str).tolist()
+    old_rows = []
+    for start in range(0, len(ticket_ids), LOOKUP_BATCH_SIZE):
+        old_rows.extend(
+            connection.execute(
+                select(
+                    models.TicketNLP.predicted_category.label("category"),
+                    models.TicketNLP.sentiment_label,
+                    models.Ticket.resolution_hours,
+                )
+                .join(models.TicketNLP, models.Ticket.ticket_id == models.TicketNLP.ticket_id)
+                .where(models.Ticket.ticket_id.in_(ticket_ids[start : start + LOOKUP_BATCH_SIZE]))
+            ).all()
+        )
+    old = pd.DataFrame(old_rows, columns=["category", "sentiment_label", "resolution_hours"])
+    new = chunk.rename(columns={"predicted_category": "category"})
+    delta = (
+        pd.concat([_summary_contributions(new, 1), _summary_contributions(old, -1)])
+        .groupby("category", sort=False)
+        .sum()
+    )
+    delta = delta[(delta != 0).any(axis=1)]
+    if delta.empty:
+        return
+
+    table = models.TicketSummary.__table__
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["category"],
+        set_={column: table.c[column] + stmt.excluded[column] for column in SUMMARY_ADDITIVE_COLUMNS},
+    )
+    records = [
+        {
+            **record,
+            "avg_resolution_hours": 0.0,
+            "positive_percent": 0.0,
+            "negative_percent": 0.0,
+            "neutral_percent": 0.0,
+        }
+        for record in delta.reset_index().to_dict(orient="records")
+    ]
+    connection.execute(stmt, records)
+    categories = delta.index.tolist()
+    connection.execute(
+        table.update()
+        .where(table.c.category.in_(categories))
+        .values(**_summary_derived_values(table), refreshed_at=datetime.utcnow())
+    )
+    connection.execute(
+        table.delete().where(table.c.category.in_(categories), table.c.ticket_count <= 0)
+    )
+
+
+def _summary_derived_values(table: Table) -> dict:
+    def ratio(column):
+        return case(
+            (table.c.ticket_count > 0, cast(column, Float) / table.c.ticket_count),
+            else_=0.0,
+        )
+
+    return {
+        "avg_resolution_hours": ratio(table.c.total_resolution_hours),
+        "positive_percent": ratio(table.c.positive_count),
+        "negative_percent": ratio(table.c.negative_count),
+        "neutral_percent": ratio(table.c.neutral_count),
+    }
+
+
+def refresh_summary() -> None:
+    """Rebuild ticket_summary from scratch in one transaction (the --full-refresh path)."""
+    stmt = """
+        SELECT tnl.predicted_category AS category,
+               COUNT(*) AS ticket_count,
+               SUM(COALESCE(t.resolution_hours, 0)) AS total_resolution_hours,
+               SUM(CASE WHEN tnl.sentiment_label = 'positive' THEN 1 ELSE 0 END) AS positive_count,
+               SUM(CASE WHEN tnl.sentiment_label = 'negative' THEN 1 ELSE 0 END) AS negative_count,
+               SUM(CASE WHEN tnl.sentiment_label = 'neutral' THEN 1 ELSE 0 END) AS neutral_count
+        FROM tickets t
+        JOIN ticket_nlp tnl ON t.ticket_id = tnl.ticket_id
+        GROUP BY tnl.predicted_category
+    """
+    table = models.TicketSummary.__table__
+    refreshed_at = datetime.utcnow()
+    with engine.begin() as connection:
+        rows = connection.execute(text(stmt)).mappings().all()
+        connection.execute(table.delete())
+        if rows:
+            connection.execute(
+                table.insert(),
+                [
+                    {
+                        **row,
+                        "avg_resolution_hours": (row["total_resolution_hours"] or 0)
+                        / row["ticket_count"],
+                        "positive_percent": row["positive_count"] / row["ticket_count"],
+                        "negative_percent": row["negative_count"] / row["ticket_count"],
+                        "neutral_percent": row["neutral_count"] / row["ticket_count"],
+                        "refreshed_at": refreshed_at,
+                    }
+                    for row in rows
+                ],
             )
-            session.add(summary)
-        session.commit()
-        logger.success("Refreshed ticket_summary table")
+    bump_data_version("tickets")
+    logger.success("Refreshed ticket_summary table")
+
+
+# Per-transaction staging for the groups a telemetry chunk touched.
+_ROLLUP_GROUPS = Table(
+    "telemetry_rollup_groups",
+    MetaData(),
+    Column("product", String, primary_key=True),
+    Column("node_id", String, primary_key=True),
+    Column("hour", DateTime, primary_key=True),
+    Column("hour_end", DateTime, nullable=False),
+    prefixes=["TEMPORARY"],
+)
+
+
+def _rollups_built() -> bool:
+    with engine.connect() as connection:
+        return (
+            connection.execute(select(models.TelemetryHourlyRollup.id).limit(1)).first()
+            is not None
+        )
 
 
-def initialize_database(tickets_file: str = "tickets_processed.csv", telemetry_file: str = "telemetry_processed.csv") -> None:
-    settings = get_settings()
+def _touched_rollup_groups(connection: Connection, chunk: pd.DataFrame) -> pd.DataFrame:
+    """Groups whose rollups the chunk's upsert will change; must run before it.
+
+    Rows whose rollup inputs are unchanged are skipped; a changed row touches
+    both the group it sits in now and the one it moves to.
+    """
+    event = models.TelemetryEvent
+    event_ids = chunk["event_id"].astype(str)
+    stored = []
+    for start in range(0, len(event_ids), LOOKUP_BATCH_SIZE):
+        stored += connection.execute(
+            select(event.event_id, *(getattr(event, c) for c in ROLLUP_SOURCE_COLUMNS)).where(
+                event.event_id.in_(event_ids.iloc[start : start + LOOKUP_BATCH_SIZE].tolist())
+            )
+        ).all()
+    previous = (
+        pd.DataFrame(stored, columns=["event_id", *ROLLUP_SOURCE_COLUMNS])
+        .set_index("event_id")
+        .reindex(event_ids)
+    )
+    previous["created_at"] = pd.to_datetime(previous["created_at"])
+    current = chunk[ROLLUP_SOURCE_COLUMNS]
+    changed = np.zeros(len(chunk), dtype=bool)
+    for column in ROLLUP_SOURCE_COLUMNS:
+        # NaN from reindex never compares equal, so new events count as changed.
+        changed |= current[column].to_numpy(dtype=object) != previous[column].to_numpy(
+            dtype=object
+        )
+    moved_from = previous[changed & previous["product"].notna().to_numpy()]
+    groups = [
+        frame[["product", "node_id"]].astype(str).assign(hour=frame["created_at"].dt.floor("h"))
+        for frame in (current[changed], moved_from)
+        if not frame.empty
+    ]
+    if not groups:
+        return pd.DataFrame(columns=GROUP_KEY)
+    return pd.concat(groups, ignore_index=True).drop_duplicates()
+
+
+def _refresh_rollup_groups(
+    connection: Connection, chunk: pd.DataFrame, groups: pd.DataFrame
+) -> None:
+    """Recompute the rollup ``groups`` from their events.
+
+    The groups are staged in a temp table so one join reads their events and
+    one statement clears their old rows, however many groups a chunk touched.
+    """
+    if groups.empty:
+        return
+    groups = groups.assign(hour_end=groups["hour"] + pd.Timedelta(hours=1))
+    staged = _ROLLUP_GROUPS
+    staged.create(connection, checkfirst=True)
+    connection.execute(staged.insert(), _records(groups, list(groups.columns)))
+    event = models.TelemetryEvent
+    rows = connection.execute(
+        select(*(getattr(event, column) for column in ROLLUP_SOURCE_COLUMNS))
+        .select_from(staged)
+        .join(
+            event,
+            and_(
+                event.node_id == staged.c.node_id,
+                event.product == staged.c.product,
+                event.created_at >= staged.c.hour,
+                event.created_at < staged.c.hour_end,
+            ),
+        )
+    ).all()
+    table = models.TelemetryHourlyRollup.__table__
+    connection.execute(
+        table.delete().where(
+            tuple_(table.c.product, table.c.node_id, table.c.hour).in_(
+                select(staged.c.product, staged.c.node_id, staged.c.hour)
+            )
+        )
+    )
+    staged.drop(connection)
+    _insert_rollups(connection, pd.DataFrame(rows, columns=ROLLUP_SOURCE_COLUMNS))
+
+
+def _insert_rollups(connection: Connection, events: pd.DataFrame) -> None:
+    rollups = aggregate_hourly(events)
+    if rollups.empty:
+        return
+    rollups["refreshed_at"] = datetime.utcnow()
+    connection.execute(
+        models.TelemetryHourlyRollup.__table__.insert(),
+        _records(rollups, list(rollups.columns)),
+    )
+
+
+def refresh_rollups(batch_rows: int = 25_000) -> None:
+    """Rebuild telemetry_hourly_rollups from scratch.
+
+    Events are read back whole nodes at a time, in batches of about
+    ``batch_rows`` events, to bound memory on large tables.
+    """
+    event = models.TelemetryEvent
+    with engine.begin() as connection:
+        connection.execute(models.TelemetryHourlyRollup.__table__.delete())
+        node_counts = connection.execute(
+            select(event.node_id, func.count()).group_by(event.node_id)
+        ).all()
+        batches: List[List[str]] = []
+        batch_events = 0
+        for node_id, count in node_counts:
+            if not batches or batch_events + count > batch_rows:
+                batches.append([])
+                batch_events = 0
+            batches[-1].append(node_id)
+            batch_events += count
+        for nodes in batches:
+            rows = connection.execute(
+                select(*(getattr(event, column) for column in ROLLUP_SOURCE_COLUMNS)).where(
+                    event.node_id.in_(nodes)
+                )
+            ).all()
+            _insert_rollups(connection, pd.DataFrame(rows, columns=ROLLUP_SOURCE_COLUMNS))
+    bump_data_version("telemetry")
+    logger.success("Refreshed telemetry_hourly_rollups for {} nodes", len(node_counts))
+
+
+def bump_data_version(name: str) -> None:
+    """Advance a dataset's version so API response caches keyed on it go stale."""
+    table = models.DataVersion.__table__
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        updated = connection.execute(
+            table.update()
+            .where(table.c.name == name)
+            .values(version=table.c.version + 1, updated_at=now)
+        ).rowcount
+        if not updated:
+            connection.execute(table.insert().values(name=name, version=1, updated_at=now))
+
+
+def initialize_database(
+    tickets_file: str = "tickets_processed.csv",
+    telemetry_file: str = "telemetry_processed.csv",
+    full_refresh: bool = False,
+) -> None:
     create_schema()
-    ticket_df = load_csv(settings.processed_dir / tickets_file)
-    telemetry_df = load_csv(settings.processed_dir / telemetry_file)
+    # Project to the loaded columns; Parquet reads skip the rest entirely.
+    ticket_df = load_processed(tickets_file, columns=TICKET_COLUMNS + TICKET_NLP_COLUMNS[1:])
+    telemetry_df = load_processed(telemetry_file, columns=TELEMETRY_COLUMNS)
     load_tickets(ticket_df)
     load_telemetry(telemetry_df)
-    refresh_summary()
+    if full_refresh:
+        refresh_summary()
+        refresh_rollups()
 
 
 def parse_args() -> argparse.Namespace:
@@ -118,18 +697,29 @@ def parse_args() -> argparse.Namespace:
         "--tickets",
         type=str,
         default="tickets_processed.csv",
-        help="Processed tickets file name relative to processed directory",
+        help="Processed tickets file name relative to processed directory "
+        "(the suffix follows PROCESSED_FORMAT)",
     )
     parser.add_argument(
         "--telemetry",
         type=str,
         default="telemetry_processed.csv",
-        help="Processed telemetry file name relative to processed directory",
+        help="Processed telemetry file name relative to processed directory "
+        "(the suffix follows PROCESSED_FORMAT)",
+    )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Rebuild ticket_summary and the telemetry rollups from scratch "
+        "instead of applying load deltas",
     )
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
-    initialize_database(tickets_file=args.tickets, telemetry_file=args.telemetry)
-
+    initialize_database(
+        tickets_file=args.tickets,
+        telemetry_file=args.telemetry,
+        full_refresh=args.full_refresh,
+    )
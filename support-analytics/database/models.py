@@ -1,6 +1,16 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 
 from database.session import Base
@@ -8,6 +18,10 @@ from database.session import Base
 
 class Ticket(Base):
     __tablename__ = "tickets"
+    __table_args__ = (
+        # Covers the trends range scan and its COUNT(ticket_id) without touching rows.
+        Index("ix_tickets_created_at_ticket_id", "created_at", "ticket_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     ticket_id = Column(String, unique=True, index=True, nullable=False)
@@ -26,6 +40,10 @@ class Ticket(Base):
 
 class TicketNLP(Base):
     __tablename__ = "ticket_nlp"
+    __table_args__ = (
+        Index("ix_ticket_nlp_category_ticket_id", "predicted_category", "ticket_id"),
+        Index("ix_ticket_nlp_sentiment_label", "sentiment_label"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     ticket_id = Column(String, ForeignKey("tickets.ticket_id"), nullable=False, unique=True)
@@ -38,6 +56,15 @@ class TicketNLP(Base):
 
 class TelemetryEvent(Base):
     __tablename__ = "telemetry"
+    __table_args__ = (
+        # The events feed filters on product/severity and pages newest-first by
+        # the (created_at, id) keyset.
+        Index("ix_telemetry_created_at_id", "created_at", "id"),
+        Index("ix_telemetry_product_created_at_id", "product", "created_at", "id"),
+        Index("ix_telemetry_severity_created_at_id", "health_severity", "created_at", "id"),
+        # Rollup maintenance re-reads the (node, hour) groups a load touched.
+        Index("ix_telemetry_node_created_at", "node_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(String, unique=True, nullable=False)
@@ -61,8 +88,89 @@ class TicketSummary(Base):
     id = Column(Integer, primary_key=True, index=True)
     category = Column(String, nullable=False)
     ticket_count = Column(Integer, nullable=False)
+    # Additive state maintained from loader deltas; the columns below derive from it.
+    total_resolution_hours = Column(Float, nullable=False, default=0.0)
+    positive_count = Column(Integer, nullable=False, default=0)
+    negative_count = Column(Integer, nullable=False, default=0)
+    neutral_count = Column(Integer, nullable=False, default=0)
     avg_resolution_hours = Column(Float, nullable=False)
     positive_percent = Column(Float, nullable=False)
     negative_percent = Column(Float, nullable=False)
     neutral_percent = Column(Float, nullable=False)
+    refreshed_at = Column(DateTime, nullable=True)
+
+
+class TelemetryHourlyRollup(Base):
+    """Per (product, node, hour) telemetry aggregates kept current by load_telemetry.
+
+    Counts, sums, maxima and the JSON count maps are additive across rows, so
+    day/week or cross-node series merge rows; the avg/percentile columns are
+    derived per row for direct dashboard use.
+    """
+
+    __tablename__ = "telemetry_hourly_rollups"
+    __table_args__ = (
+        UniqueConstraint("product", "node_id", "hour", name="uq_telemetry_rollup_group"),
+        Index("ix_telemetry_rollups_hour", "hour"),
+        Index("ix_telemetry_rollups_product_hour", "product", "hour"),
+        Index("ix_telemetry_rollups_node_hour", "node_id", "hour"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    product = Column(String, nullable=False)
+    node_id = Column(String, nullable=False)
+    hour = Column(DateTime, nullable=False)
+    event_count = Column(Integer, nullable=False)
+    normal_count = Column(Integer, nullable=False, default=0)
+    elevated_count = Column(Integer, nullable=False, default=0)
+    high_count = Column(Integer, nullable=False, default=0)
+    critical_count = Column(Integer, nullable=False, default=0)
+    # {"event_type": count}
+    event_type_counts = Column(Text, nullable=False)
+    cpu_usage_sum = Column(Float, nullable=False)
+    cpu_usage_max = Column(Float, nullable=False)
+    cpu_usage_avg = Column(Float, nullable=False)
+    storage_utilization_sum = Column(Float, nullable=False)
+    storage_utilization_max = Column(Float, nullable=False)
+    storage_utilization_avg = Column(Float, nullable=False)
+    # Exact sparse histogram {"response_time_ms": count}.
+    response_time_histogram = Column(Text, nullable=False)
+    response_time_p50 = Column(Integer, nullable=True)
+    response_time_p95 = Column(Integer, nullable=True)
+    refreshed_at = Column(DateTime, nullable=False)
+
+
+class EtlCheckpoint(Base):
+    __tablename__ = "etl_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    pipeline = Column(String, unique=True, nullable=False)
+    source_path = Column(String, nullable=False)
+    source_size_bytes = Column(Integer, nullable=False, default=0)
+    rows_seen = Column(Integer, nullable=False, default=0)
+    rows_processed = Column(Integer, nullable=False, default=0)
+    high_water_mark = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=False)
+
+
+class EtlRowHash(Base):
+    __tablename__ = "etl_row_hashes"
+    __table_args__ = (
+        UniqueConstraint("pipeline", "record_id", name="uq_etl_row_hashes_record"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    pipeline = Column(String, nullable=False)
+    record_id = Column(String, nullable=False)
+    row_hash = Column(String, nullable=False)
+
 
+class DataVersion(Base):
+    """Monotonic per-dataset version, bumped by loaders to invalidate API caches."""
+
+    __tablename__ = "data_versions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False)
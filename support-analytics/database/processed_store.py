@@ -0,0 +1,98 @@
+"""Read and write the processed datasets as CSV or partitioned Parquet."""
+
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import pandas as pd
+from loguru import logger
+
+from config import get_settings
+
+PROCESSED_FORMATS = ("csv", "parquet")
+PARQUET_COMPRESSION = "zstd"
+PARQUET_PART_TEMPLATE = "part-{:05d}.parquet"
+# Column whose calendar day delimits row groups, so date-filtered reads can
+# skip whole row groups from the footer statistics.
+PARTITION_COLUMN = "created_at"
+
+
+def _check_format(fmt: str) -> str:
+    if fmt not in PROCESSED_FORMATS:
+        raise ValueError(
+            f"Unknown processed format {fmt!r}; expected one of {PROCESSED_FORMATS}"
+        )
+    return fmt
+
+
+def processed_path(file_name: str, fmt: Optional[str] = None) -> Path:
+    """Resolve ``file_name`` under processed_dir with the suffix for ``fmt``.
+
+    Parquet output is a directory of part files (``tickets_processed.parquet/``),
+    one per write, so streaming runs can append without rewriting earlier parts.
+    """
+    settings = get_settings()
+    fmt = _check_format(fmt or settings.processed_format)
+    return settings.processed_dir / Path(file_name).with_suffix(f".{fmt}")
+
+
+def write_processed(
+    df: pd.DataFrame,
+    file_name: str,
+    fmt: Optional[str] = None,
+    append: bool = False,
+) -> Path:
+    fmt = _check_format(fmt or get_settings().processed_format)
+    output_path = processed_path(file_name, fmt)
+    if fmt == "csv":
+        df.to_csv(output_path, index=False, mode="a" if append else "w", header=not append)
+        return output_path
+
+    if not append and output_path.is_dir():
+        shutil.rmtree(output_path)
+    output_path.mkdir(parents=True, exist_ok=True)
+    part = len(list(output_path.glob("part-*.parquet")))
+    _write_parquet_part(df, output_path / PARQUET_PART_TEMPLATE.format(part))
+    return output_path
+
+
+def _write_parquet_part(df: pd.DataFrame, path: Path) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if PARTITION_COLUMN in df.columns:
+        days = pd.to_datetime(df[PARTITION_COLUMN]).dt.normalize()
+        order = days.argsort(kind="stable")
+        df, days = df.iloc[order], days.iloc[order]
+        # Row-group boundaries fall where the day changes.
+        boundaries = [0, *(days.ne(days.shift()).to_numpy().nonzero()[0][1:]), len(df)]
+    else:
+        boundaries = [0, len(df)]
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(path, table.schema, compression=PARQUET_COMPRESSION) as writer:
+        for start, stop in zip(boundaries, boundaries[1:]):
+            if stop > start:
+                writer.write_table(table.slice(start, stop - start))
+
+
+def load_processed(
+    file_name: str,
+    columns: Optional[Sequence[str]] = None,
+    fmt: Optional[str] = None,
+) -> pd.DataFrame:
+    """Load a processed dataset, reading only ``columns`` when given."""
+    fmt = _check_format(fmt or get_settings().processed_format)
+    path = processed_path(file_name, fmt)
+    if not path.exists():
+        raise FileNotFoundError(f"Expected processed file missing: {path}")
+    usecols: Optional[List[str]] = list(columns) if columns is not None else None
+    logger.info(
+        "Loading processed {} ({} columns)", path, "all" if usecols is None else len(usecols)
+    )
+    if fmt == "csv":
+        return pd.read_csv(path, usecols=usecols)
+    import pyarrow.parquet as pq
+
+    return pq.read_table(path, columns=usecols).to_pandas()
@@ -0,0 +1,158 @@
+"""Aggregation helpers for the hourly telemetry rollup table.
+
+Rollup rows hold additive state per (product, node, hour): event and severity
+counts, CPU/storage sums and maxima, event-type counts and an exact sparse
+histogram of ``response_time_ms`` (``{"ms": count}`` JSON). Sums, maxima and
+count maps merge across rows, so the API can serve day/week series (or
+cross-node series) from the same rows and still report exact percentiles.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+GROUP_KEY = ["product", "node_id", "hour"]
+SEVERITY_COLUMNS = {
+    "Normal": "normal_count",
+    "Elevated": "elevated_count",
+    "High": "high_count",
+    "Critical": "critical_count",
+}
+ROLLUP_SOURCE_COLUMNS = [
+    "product",
+    "node_id",
+    "created_at",
+    "event_type",
+    "health_severity",
+    "cpu_usage",
+    "storage_utilization",
+    "response_time_ms",
+]
+PERCENTILES = {"response_time_p50": 0.5, "response_time_p95": 0.95}
+
+
+def floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def period_start(hour: datetime, granularity: str) -> datetime:
+    """Bucket start for ``granularity`` ``hour``, ``day`` or ``week`` (weeks start Monday)."""
+    if granularity == "hour":
+        return hour
+    day = hour.replace(hour=0)
+    if granularity == "day":
+        return day
+    return day - timedelta(days=day.weekday())
+
+
+def encode_counts(counts: Mapping) -> str:
+    return json.dumps({str(key): int(value) for key, value in counts.items()})
+
+
+def decode_counts(text: Optional[str]) -> Dict[str, int]:
+    return json.loads(text) if text else {}
+
+
+def merge_counts(target: Dict[str, int], counts: Mapping[str, int]) -> Dict[str, int]:
+    for key, value in counts.items():
+        target[key] = target.get(key, 0) + value
+    return target
+
+
+def histogram_percentile(histogram: Mapping[str, int], quantile: float) -> Optional[int]:
+    """Nearest-rank percentile of a sparse ``{"value": count}`` histogram."""
+    total = sum(histogram.values())
+    if not total:
+        return None
+    rank = max(1, math.ceil(quantile * total))
+    seen = 0
+    for value, count in sorted(((int(value), count) for value, count in histogram.items())):
+        seen += count
+        if seen >= rank:
+            return value
+    return None  # pragma: no cover - rank <= total always lands above
+
+
+def _group_counts(frame: pd.DataFrame, column: str) -> Tuple[pd.Series, np.ndarray]:
+    """``column`` value counts per group, sorted by group then value, plus group starts."""
+    sizes = frame.groupby([*GROUP_KEY, column], sort=True, observed=True).size()
+    codes = np.vstack(sizes.index.codes[: len(GROUP_KEY)])
+    starts = np.flatnonzero(np.r_[True, (codes[:, 1:] != codes[:, :-1]).any(axis=0)])
+    return sizes, starts
+
+
+def _encode_group_counts(sizes: pd.Series, starts: np.ndarray) -> List[str]:
+    """Same JSON as ``encode_counts`` per group, without a json.dumps call per group."""
+    values = sizes.index.get_level_values(-1)
+    quoted = {value: json.dumps(str(value)) for value in values.unique()}
+    parts = (values.map(quoted) + ": " + sizes.astype(str).to_numpy()).to_numpy()
+    bounds = [*starts[1:], len(parts)]
+    return ["{" + ", ".join(parts[start:stop]) + "}" for start, stop in zip(starts, bounds)]
+
+
+def _group_percentiles(sizes: pd.Series, starts: np.ndarray, quantile: float) -> np.ndarray:
+    """Vectorized ``histogram_percentile`` for every group of ``sizes``."""
+    counts = sizes.to_numpy()
+    group = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(counts)]))
+    running = np.cumsum(counts)
+    within = running - np.r_[0, running][starts][group]
+    totals = np.add.reduceat(counts, starts)
+    ranks = np.maximum(1, np.ceil(quantile * totals))
+    hits = np.flatnonzero(within >= ranks[group])
+    first = hits[np.r_[True, group[hits][1:] != group[hits][:-1]]]
+    return sizes.index.get_level_values(-1).to_numpy()[first]
+
+
+def aggregate_hourly(events: pd.DataFrame) -> pd.DataFrame:
+    """Build one rollup row per (product, node, hour) present in ``events``."""
+    columns = [
+        *GROUP_KEY,
+        "event_count",
+        *SEVERITY_COLUMNS.values(),
+        "event_type_counts",
+        "cpu_usage_sum",
+        "cpu_usage_max",
+        "cpu_usage_avg",
+        "storage_utilization_sum",
+        "storage_utilization_max",
+        "storage_utilization_avg",
+        "response_time_histogram",
+        *PERCENTILES,
+    ]
+    if events.empty:
+        return pd.DataFrame(columns=columns)
+    frame = events.assign(hour=pd.to_datetime(events["created_at"]).dt.floor("h"))
+    grouped = frame.groupby(GROUP_KEY, sort=True, observed=True)
+    rollups = grouped.agg(
+        event_count=("event_type", "size"),
+        cpu_usage_sum=("cpu_usage", "sum"),
+        cpu_usage_max=("cpu_usage", "max"),
+        storage_utilization_sum=("storage_utilization", "sum"),
+        storage_utilization_max=("storage_utilization", "max"),
+    )
+    rollups["cpu_usage_avg"] = rollups["cpu_usage_sum"] / rollups["event_count"]
+    rollups["storage_utilization_avg"] = (
+        rollups["storage_utilization_sum"] / rollups["event_count"]
+    )
+    severities = (
+        frame.groupby([*GROUP_KEY, "health_severity"], sort=True, observed=True)
+        .size()
+        .unstack(fill_value=0)
+        .reindex(columns=list(SEVERITY_COLUMNS), fill_value=0)
+        .rename(columns=SEVERITY_COLUMNS)
+    )
+    rollups = rollups.join(severities)
+
+    # Both groupings sort on the same key, so the per-group lists line up with rollups.
+    rollups["event_type_counts"] = _encode_group_counts(*_group_counts(frame, "event_type"))
+    histogram = _group_counts(frame, "response_time_ms")
+    rollups["response_time_histogram"] = _encode_group_counts(*histogram)
+    for column, quantile in PERCENTILES.items():
+        rollups[column] = _group_percentiles(*histogram, quantile)
+    return rollups.reset_index()[columns]
@@ -12,6 +12,8 @@ CREATE TABLE IF NOT EXISTS tickets (
     severity_score INTEGER
 );
 
+CREATE INDEX IF NOT EXISTS ix_tickets_created_at_ticket_id ON tickets (created_at, ticket_id);
+
 CREATE TABLE IF NOT EXISTS ticket_nlp (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     ticket_id TEXT REFERENCES tickets(ticket_id),
@@ -20,6 +22,9 @@ CREATE TABLE IF NOT EXISTS ticket_nlp (
     sentiment_score REAL
 );
 
+CREATE INDEX IF NOT EXISTS ix_ticket_nlp_category_ticket_id ON ticket_nlp (predicted_category, ticket_id);
+CREATE INDEX IF NOT EXISTS ix_ticket_nlp_sentiment_label ON ticket_nlp (sentiment_label);
+
 CREATE TABLE IF NOT EXISTS telemetry (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     event_id TEXT UNIQUE,
@@ -34,13 +39,76 @@ CREATE TABLE IF NOT EXISTS telemetry (
     created_at TEXT
 );
 
+CREATE INDEX IF NOT EXISTS ix_telemetry_created_at_id ON telemetry (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_telemetry_product_created_at_id ON telemetry (product, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_telemetry_severity_created_at_id ON telemetry (health_severity, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_telemetry_node_created_at ON telemetry (node_id, created_at);
+
 CREATE TABLE IF NOT EXISTS ticket_summary (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    category TEXT,
+    category TEXT UNIQUE,
     ticket_count INTEGER,
+    total_resolution_hours REAL,
+    positive_count INTEGER,
+    negative_count INTEGER,
+    neutral_count INTEGER,
     avg_resolution_hours REAL,
     positive_percent REAL,
     negative_percent REAL,
-    neutral_percent REAL
+    neutral_percent REAL,
+    refreshed_at TEXT
 );
 
+CREATE TABLE IF NOT EXISTS telemetry_hourly_rollups (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    product TEXT,
+    node_id TEXT,
+    hour TEXT,
+    event_count INTEGER,
+    normal_count INTEGER,
+    elevated_count INTEGER,
+    high_count INTEGER,
+    critical_count INTEGER,
+    event_type_counts TEXT,
+    cpu_usage_sum REAL,
+    cpu_usage_max REAL,
+    cpu_usage_avg REAL,
+    storage_utilization_sum REAL,
+    storage_utilization_max REAL,
+    storage_utilization_avg REAL,
+    response_time_histogram TEXT,
+    response_time_p50 INTEGER,
+    response_time_p95 INTEGER,
+    refreshed_at TEXT,
+    UNIQUE (product, node_id, hour)
+);
+
+CREATE INDEX IF NOT EXISTS ix_telemetry_rollups_hour ON telemetry_hourly_rollups (hour);
+CREATE INDEX IF NOT EXISTS ix_telemetry_rollups_product_hour ON telemetry_hourly_rollups (product, hour);
+CREATE INDEX IF NOT EXISTS ix_telemetry_rollups_node_hour ON telemetry_hourly_rollups (node_id, hour);
+
+CREATE TABLE IF NOT EXISTS etl_checkpoints (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pipeline TEXT UNIQUE,
+    source_path TEXT,
+    source_size_bytes INTEGER,
+    rows_seen INTEGER,
+    rows_processed INTEGER,
+    high_water_mark TEXT,
+    updated_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS etl_row_hashes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pipeline TEXT,
+    record_id TEXT,
+    row_hash TEXT,
+    UNIQUE (pipeline, record_id)
+);
+
+CREATE TABLE IF NOT EXISTS data_versions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE,
+    version INTEGER,
+    updated_at TEXT
+);
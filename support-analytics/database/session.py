@@ -1,14 +1,57 @@
 from __future__ import annotations
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
 
-from config import get_settings
+from config import Settings, get_settings
 
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, future=True)
+
+def _is_memory_sqlite(database: str | None) -> bool:
+    return not database or database == ":memory:" or database.startswith("file::memory:")
+
+
+def _apply_sqlite_pragmas(engine: Engine, settings: Settings, in_memory: bool) -> None:
+    """Tune every new SQLite connection so ETL writes don't stall API reads.
+
+    WAL lets readers keep working while a loader holds the write lock, and
+    synchronous=NORMAL is durable under WAL without an fsync per commit.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if not in_memory:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kib)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size_bytes)}")
+        cursor.close()
+
+
+def build_engine(settings: Settings) -> Engine:
+    url = make_url(settings.database_url)
+    options = {"future": True, "pool_pre_ping": settings.db_pool_pre_ping}
+    is_sqlite = url.get_backend_name() == "sqlite"
+    in_memory = is_sqlite and _is_memory_sqlite(url.database)
+    # In-memory SQLite uses a per-thread singleton pool that takes no sizing options.
+    if not in_memory:
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_recycle=settings.db_pool_recycle_seconds,
+        )
+    engine = create_engine(settings.database_url, **options)
+    if is_sqlite:
+        _apply_sqlite_pragmas(engine, settings, in_memory)
+    return engine
+
+
+engine = build_engine(settings)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
 Base = declarative_base()
@@ -21,4 +64,3 @@ def get_session():
         yield db
     finally:
         db.close()
-
@@ -1,6 +1,18 @@
 """ETL package for the Customer Support Ticket Intelligence project."""
 
-from .ticket_etl import run_ticket_pipeline  # noqa: F401
-from .telemetry_etl import run_telemetry_pipeline  # noqa: F401
+from importlib import import_module
 
+# Resolved on first access so importing one pipeline (or a helper module such
+# as etl.incremental) does not import the other pipeline's dependencies.
+_LAZY_EXPORTS = {
+    "run_ticket_pipeline": "etl.ticket_etl",
+    "run_telemetry_pipeline": "etl.telemetry_etl",
+}
 
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(import_module(_LAZY_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
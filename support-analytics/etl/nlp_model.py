@@ -2,17 +2,25 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import re
+import sqlite3
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, Iterable, Tuple
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
-import spacy
+import numpy as np
+import pandas as pd
 from loguru import logger
 
-try:
-    from transformers import pipeline
-except Exception:  # pragma: no cover - transformers optional at runtime
-    pipeline = None  # type: ignore
+if TYPE_CHECKING:  # pragma: no cover
+    from etl.parallel_nlp import ParallelSentimentScorer
+
+# spaCy and transformers (and through it torch) take seconds to import, so
+# they are loaded on first use; see TicketNLPProcessor.warm_up.
+_NOT_LOADED = object()
 
 
 CATEGORY_RULES: Dict[str, Iterable[str]] = {
@@ -47,7 +55,13 @@ CATEGORY_RULES: Dict[str, Iterable[str]] = {
 }
 
 
+DEFAULT_CATEGORY = "Other"
 SENTIMENT_DEFAULT_THRESHOLD = 0.55
+SENTIMENT_MAX_CHARS = 512
+SENTIMENT_BATCH_SIZE = 32
+NLP_CACHE_FILE = "nlp_cache.sqlite"
+SENTIMENT_BACKENDS = ("torch", "torch-int8", "onnx", "heuristic")
+ONNX_MODEL_FILE = "model.onnx"
 
 
 @dataclass
@@ -56,52 +70,493 @@ class SentimentResult:
     score: float
 
 
+class CategoryMatcher:
+    """Keyword rules compiled into a single regex automaton.
+
+    Every keyword goes into one prefix-factored alternation wrapped in a
+    lookahead, so a single pass reports all keyword hits (overlapping ones
+    included). The category listed first in the rules wins, matching the
+    original loop-over-categories behaviour.
+    """
+
+    def __init__(
+        self,
+        rules: Mapping[str, Iterable[str]],
+        default: str = DEFAULT_CATEGORY,
+    ) -> None:
+        self.default = default
+        self.categories: List[str] = []
+        priorities: Dict[str, int] = {}
+        for category, keywords in rules.items():
+            if category == default:
+                continue
+            self.categories.append(category)
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword and keyword not in priorities:
+                    priorities[keyword] = len(self.categories) - 1
+        # The lookahead captures the longest keyword starting at each position;
+        # any shorter keyword starting there is a prefix of it, so fold the best
+        # priority of every prefix into the longer keyword.
+        self._priority = {
+            keyword: min(
+                priorities[keyword[:end]]
+                for end in range(1, len(keyword) + 1)
+                if keyword[:end] in priorities
+            )
+            for keyword in priorities
+        }
+        self._pattern = (
+            re.compile(f"(?=({_trie_pattern(priorities)}))") if priorities else None
+        )
+
+    def match(self, text: str) -> str:
+        if self._pattern is None:
+            return self.default
+        best: Optional[int] = None
+        for keyword in self._pattern.findall(text.lower()):
+            rank = self._priority[keyword]
+            if best is None or rank < best:
+                best = rank
+                if rank == 0:
+                    break
+        return self.default if best is None else self.categories[best]
+
+    def match_series(self, texts: pd.Series) -> pd.Series:
+        """Categorize a whole Series, matching each distinct value once."""
+        codes, uniques = pd.factorize(texts.astype(str), sort=False)
+        labels = np.array([self.match(text) for text in uniques], dtype=object)
+        return pd.Series(labels[codes], index=texts.index, name=texts.name)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"hits={self.hits} (disk={self.disk_hits}) misses={self.misses} "
+            f"hit_rate={self.hit_rate:.1%}"
+        )
+
+
+class NLPResultCache:
+    """Content-addressed NLP results: in-process LRU backed by optional SQLite file.
+
+    Keys hash the sanitized text together with a namespace naming the model (or
+    rule set) that produced the value, so a model swap never serves stale results.
+    """
+
+    def __init__(self, max_entries: int = 50_000, path: Optional[Path] = None) -> None:
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self.stats = CacheStats()
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path))
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS nlp_results (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(namespace: str, text: str) -> str:
+        payload = f"{namespace}\x00{sanitize_text(text)}"
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[tuple]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+        if self._conn is not None:
+            row = self._conn.execute(
+                "SELECT value FROM nlp_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                value = tuple(json.loads(row[0]))
+                self._remember(key, value)
+                self.stats.hits += 1
+                self.stats.disk_hits += 1
+                return value
+        self.stats.misses += 1
+        return None
+
+    def put_many(self, items: Iterable[Tuple[str, tuple]]) -> None:
+        items = list(items)
+        for key, value in items:
+            self._remember(key, value)
+        if self._conn is not None and items:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO nlp_results (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in items],
+            )
+            self._conn.commit()
+
+    def put(self, key: str, value: tuple) -> None:
+        self.put_many([(key, value)])
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: str, value: tuple) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+class OnnxSentimentPipeline:
+    """ONNX Runtime stand-in for the transformers sentiment pipeline.
+
+    Loads ``model.onnx`` plus the tokenizer and ``config.json`` saved next to
+    it (e.g. by ``optimum-cli export onnx``) without touching the network or
+    torch, and returns the same ``[{"label", "score"}]`` records.
+    """
+
+    def __init__(self, session, tokenizer, id2label: Mapping[int, str]) -> None:
+        self._session = session
+        self._tokenizer = tokenizer
+        self._id2label = {int(idx): label for idx, label in id2label.items()}
+        self._input_names = {node.name for node in session.get_inputs()}
+
+    @classmethod
+    def from_directory(cls, model_dir: Path, threads: Optional[int] = None):
+        import onnxruntime
+        from transformers import AutoConfig, AutoTokenizer
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        session = onnxruntime.InferenceSession(
+            str(Path(model_dir) / ONNX_MODEL_FILE),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        tokenizer = AutoTokenizer.from_pretrained(model_dir, local_files_only=True)
+        config = AutoConfig.from_pretrained(model_dir, local_files_only=True)
+        return cls(session, tokenizer, config.id2label)
+
+    def __call__(self, inputs, batch_size: Optional[int] = None, truncation: bool = True):
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        batch_size = batch_size or len(texts) or 1
+        outputs: List[dict] = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self._tokenizer(
+                texts[start : start + batch_size],
+                padding=True,
+                truncation=truncation,
+                max_length=SENTIMENT_MAX_CHARS,
+                return_tensors="np",
+            )
+            feeds = {
+                name: np.asarray(value, dtype=np.int64)
+                for name, value in encoded.items()
+                if name in self._input_names
+            }
+            logits = self._session.run(None, feeds)[0]
+            shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probabilities = shifted / shifted.sum(axis=1, keepdims=True)
+            for row in probabilities:
+                best = int(row.argmax())
+                outputs.append({"label": self._id2label[best], "score": float(row[best])})
+        return outputs
+
+
+def check_sentiment_backend(backend: str, onnx_model_dir: Optional[Path] = None) -> None:
+    """Raise on a backend configuration that can never load.
+
+    Missing optional dependencies and model load failures fall back to
+    heuristics; an unknown backend or a missing ONNX export does not.
+    """
+    if backend not in SENTIMENT_BACKENDS:
+        raise ValueError(
+            f"Unknown sentiment backend {backend!r}; expected one of {SENTIMENT_BACKENDS}"
+        )
+    if backend != "onnx":
+        return
+    if onnx_model_dir is None:
+        raise ValueError("The onnx sentiment backend needs onnx_model_dir")
+    model_path = Path(onnx_model_dir) / ONNX_MODEL_FILE
+    if not model_path.is_file():
+        raise FileNotFoundError(
+            f"No ONNX sentiment model at {model_path}; export one with optimum-cli first"
+        )
+
+
+def load_sentiment_pipeline(
+    backend: str,
+    model_name: str,
+    onnx_model_dir: Optional[Path] = None,
+    threads: Optional[int] = None,
+):
+    """Build the sentiment callable for ``backend``; ``None`` means heuristics only."""
+    check_sentiment_backend(backend, onnx_model_dir)
+    if backend == "heuristic":
+        return None
+    try:
+        if backend == "onnx":
+            return OnnxSentimentPipeline.from_directory(onnx_model_dir, threads=threads)
+        from transformers import pipeline
+
+        if backend == "torch":
+            return pipeline("sentiment-analysis", model=model_name)
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        # Dynamic int8 quantization of the Linear layers: weights are stored in
+        # int8 and activations quantized on the fly, no calibration data needed.
+        model = torch.quantization.quantize_dynamic(
+            AutoModelForSequenceClassification.from_pretrained(model_name).eval(),
+            {torch.nn.Linear},
+            dtype=torch.qint8,
+        )
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+    except ImportError as exc:  # pragma: no cover - backend dependencies optional at runtime
+        logger.warning(
+            "{} sentiment backend unavailable ({}); using heuristics only", backend, exc
+        )
+    except Exception as exc:  # pragma: no cover - model download/load failure
+        logger.warning("Falling back to heuristic sentiment: {}", exc)
+    return None
+
+
 class TicketNLPProcessor:
-    """Wrap spaCy category heuristics + HuggingFace sentiment pipeline."""
+    """Wrap spaCy category heuristics + HuggingFace sentiment pipeline.
+
+    Models load on first inference (or ``warm_up``), so constructing a
+    processor is cheap. ``backend`` picks the sentiment implementation from
+    ``SENTIMENT_BACKENDS``; cached results are namespaced per backend because
+    quantized and exported models may not reproduce fp32 scores exactly.
+    """
 
-    def __init__(self, sentiment_model: str) -> None:
-        self._nlp = spacy.blank("en")
+    def __init__(
+        self,
+        sentiment_model: str,
+        cache: Optional[NLPResultCache] = None,
+        scorer: Optional["ParallelSentimentScorer"] = None,
+        backend: str = "torch",
+        onnx_model_dir: Optional[Path] = None,
+        threads: Optional[int] = None,
+    ) -> None:
+        if backend not in SENTIMENT_BACKENDS:
+            raise ValueError(
+                f"Unknown sentiment backend {backend!r}; expected one of {SENTIMENT_BACKENDS}"
+            )
+        self._nlp = _NOT_LOADED
         self._sentiment_model_name = sentiment_model
-        self._sentiment_pipeline = self._load_sentiment_pipeline(sentiment_model)
-        logger.info("TicketNLPProcessor initialized with %s", sentiment_model)
+        self._backend = backend
+        self._onnx_model_dir = onnx_model_dir
+        self._threads = threads
+        # With a worker pool the model lives in the workers; never load a copy here.
+        self._scorer = scorer
+        self._sentiment_pipeline = None if scorer is not None else _NOT_LOADED
+        self._cache = cache
+        self._category_matcher = CategoryMatcher(CATEGORY_RULES)
+        self._category_namespace = f"category:{_rules_fingerprint(CATEGORY_RULES)}"
+        self._sentiment_namespace = f"sentiment:{backend}:{sentiment_model}"
+        logger.info("TicketNLPProcessor initialized with {} ({})", sentiment_model, backend)
 
-    def _load_sentiment_pipeline(self, model_name: str):
-        if pipeline is None:
-            logger.warning("transformers pipeline unavailable; using heuristics only")
-            return None
-        try:
-            return pipeline("sentiment-analysis", model=model_name)
-        except Exception as exc:  # pragma: no cover - transformers download failure
-            logger.warning("Falling back to heuristic sentiment: %s", exc)
-            return None
+    def warm_up(self) -> "TicketNLPProcessor":
+        """Load spaCy and the sentiment model now instead of on first inference."""
+        _ = self.spacy_nlp
+        self._get_sentiment_pipeline()
+        return self
+
+    @property
+    def spacy_nlp(self):
+        if self._nlp is _NOT_LOADED:
+            import spacy
+
+            self._nlp = spacy.blank("en")
+        return self._nlp
+
+    @property
+    def sentiment_available(self) -> bool:
+        """Whether sentiment comes from the configured backend, not the heuristic fallback.
+
+        Loads the model if needed. With a worker pool the model lives in the
+        workers, which flag fallback results per text instead.
+        """
+        if self._scorer is not None or self._backend == "heuristic":
+            return True
+        return self._get_sentiment_pipeline() is not None
+
+    @property
+    def sentiment_backend(self) -> str:
+        if self._scorer is not None:
+            return f"{self._scorer.workers} worker processes"
+        if not self.sentiment_available:
+            return "heuristic fallback"
+        return self._backend
+
+    def _get_sentiment_pipeline(self):
+        if self._sentiment_pipeline is _NOT_LOADED:
+            self._sentiment_pipeline = load_sentiment_pipeline(
+                self._backend,
+                self._sentiment_model_name,
+                onnx_model_dir=self._onnx_model_dir,
+                threads=self._threads,
+            )
+        return self._sentiment_pipeline
+
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        return self._cache.stats if self._cache is not None else None
 
     def predict_category(self, text: str) -> str:
-        text_lower = text.lower()
-        for category, keywords in CATEGORY_RULES.items():
-            if category == "Other":
-                continue
-            if any(keyword in text_lower for keyword in keywords):
-                return category
-        return "Other"
+        cached = self._cache_get(self._category_namespace, text)
+        if cached is not None:
+            return cached[0]
+        category = self._category_matcher.match(text)
+        self._cache_put(self._category_namespace, [(text, (category,))])
+        return category
+
+    def predict_categories(self, texts: pd.Series) -> pd.Series:
+        """Vectorized predict_category; rule matching is cheaper than a cache lookup."""
+        return self._category_matcher.match_series(texts)
 
     def analyze_sentiment(self, text: str) -> SentimentResult:
         if not text.strip():
             return SentimentResult("neutral", 0.0)
-        if self._sentiment_pipeline:
+        cached = self._cache_get(self._sentiment_namespace, text)
+        if cached is not None:
+            return SentimentResult(*cached)
+        result, from_model = self._score_one(text)
+        if from_model:
+            self._cache_put(self._sentiment_namespace, [(text, (result.label, result.score))])
+        return result
+
+    def _score_one(self, text: str) -> Tuple[SentimentResult, bool]:
+        if self._scorer is not None:
+            results, from_model = self._scorer.score([text])
+            return results[0], from_model[0]
+        sentiment_pipeline = self._get_sentiment_pipeline()
+        if sentiment_pipeline:
+            try:
+                result = sentiment_pipeline(text[:SENTIMENT_MAX_CHARS])[0]
+                return _to_sentiment_result(result), True
+            except Exception as exc:  # pragma: no cover - runtime fallback
+                logger.warning("Sentiment pipeline error, using heuristic: {}", exc)
+        return self._heuristic_sentiment(text), self._backend == "heuristic"
+
+    def analyze_sentiment_batch(
+        self,
+        texts: Sequence[str],
+        batch_size: int = SENTIMENT_BATCH_SIZE,
+    ) -> List[SentimentResult]:
+        """Score many texts with padded micro-batches instead of one pass per text.
+
+        Texts are whitespace-normalized and each distinct one is scored once,
+        reusing cached results where available. The
+        remaining texts are bucketed by length before batching so each padded
+        batch holds similarly sized inputs; results keep the original order.
+        With a ``scorer`` the remaining texts are sharded across its workers,
+        which bucket and batch their own shard. Only results the configured
+        backend produced are cached, never heuristic fallbacks.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        normalized = [sanitize_text(text) for text in texts]
+        resolved: Dict[str, SentimentResult] = {}
+        pending: List[str] = []
+        for text in dict.fromkeys(normalized):
+            if not text.strip():
+                resolved[text] = SentimentResult("neutral", 0.0)
+                continue
+            cached = self._cache_get(self._sentiment_namespace, text)
+            if cached is None:
+                pending.append(text)
+            else:
+                resolved[text] = SentimentResult(*cached)
+        if self._cache is not None:
+            self._cache.stats.hits += len(normalized) - len(resolved) - len(pending)
+
+        if self._scorer is not None:
+            scored, from_model = self._scorer.score(pending, batch_size=batch_size)
+        else:
+            scored, from_model = self.score_texts(pending, batch_size=batch_size)
+        resolved.update(zip(pending, scored))
+        # Heuristic fallbacks are not model output; caching them would outlive the outage.
+        self._cache_put(
+            self._sentiment_namespace,
+            [
+                (text, (result.label, result.score))
+                for text, result, cacheable in zip(pending, scored, from_model)
+                if cacheable
+            ],
+        )
+        return [resolved[text] for text in normalized]
+
+    def score_texts(
+        self,
+        texts: Sequence[str],
+        batch_size: int = SENTIMENT_BATCH_SIZE,
+    ) -> Tuple[List[SentimentResult], List[bool]]:
+        """Score ``texts`` in length-bucketed batches, bypassing the cache.
+
+        Returns the results in input order plus, per text, whether it came from
+        the configured backend (``False`` when a batch fell back to the heuristic).
+        """
+        results: List[Optional[SentimentResult]] = [None] * len(texts)
+        from_model = [False] * len(texts)
+        order = sorted(range(len(texts)), key=lambda index: len(texts[index]))
+        for start in range(0, len(order), batch_size):
+            indices = order[start : start + batch_size]
+            scored, batch_from_model = self._score_batch([texts[index] for index in indices])
+            for index, result in zip(indices, scored):
+                results[index] = result
+                from_model[index] = batch_from_model
+        return results, from_model
+
+    def _score_batch(self, batch: List[str]) -> Tuple[List[SentimentResult], bool]:
+        sentiment_pipeline = self._get_sentiment_pipeline()
+        if sentiment_pipeline:
             try:
-                result = self._sentiment_pipeline(text[:512])[0]
-                label = result["label"].lower()
-                score = float(result["score"])
-                if "neg" in label:
-                    label = "negative"
-                elif "pos" in label:
-                    label = "positive"
-                else:
-                    label = "neutral"
-                return SentimentResult(label, score)
+                outputs = sentiment_pipeline(
+                    [text[:SENTIMENT_MAX_CHARS] for text in batch],
+                    batch_size=len(batch),
+                    truncation=True,
+                )
+                return [_to_sentiment_result(output) for output in outputs], True
             except Exception as exc:  # pragma: no cover - runtime fallback
-                logger.warning("Sentiment pipeline error, using heuristic: %s", exc)
-        return self._heuristic_sentiment(text)
+                logger.warning(
+                    "Sentiment pipeline error on batch of {}, using heuristic: {}",
+                    len(batch),
+                    exc,
+                )
+        heuristic = [self._heuristic_sentiment(text) for text in batch]
+        return heuristic, self._backend == "heuristic"
+
+    def _cache_get(self, namespace: str, text: str) -> Optional[tuple]:
+        if self._cache is None:
+            return None
+        return self._cache.get(NLPResultCache.make_key(namespace, text))
+
+    def _cache_put(self, namespace: str, items: List[Tuple[str, tuple]]) -> None:
+        if self._cache is None:
+            return
+        self._cache.put_many(
+            (NLPResultCache.make_key(namespace, text), value) for text, value in items
+        )
 
     def _heuristic_sentiment(self, text: str) -> SentimentResult:
         text_lower = text.lower()
@@ -118,8 +573,47 @@ class TicketNLPProcessor:
         return SentimentResult(label, score)
 
 
+def _to_sentiment_result(result: dict) -> SentimentResult:
+    label = result["label"].lower()
+    score = float(result["score"])
+    if "neg" in label:
+        label = "negative"
+    elif "pos" in label:
+        label = "positive"
+    else:
+        label = "neutral"
+    return SentimentResult(label, score)
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Render words as a prefix-factored regex that prefers the longest match."""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, dict]) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + render(child) for char, child in node.items() if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return body + "?" if len(branches) == 1 and len(body) == 1 else f"(?:{body})?"
+        return body
+
+    return render(trie)
+
+
+def _rules_fingerprint(rules: Dict[str, Iterable[str]]) -> str:
+    payload = json.dumps({category: list(keywords) for category, keywords in rules.items()})
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
 def sanitize_text(value: str) -> str:
-    """Normalize whitespace to keep downstream processing clean."""
-    return re.sub(r"\\s+", " ", value).strip()
+    """Normalize whitespace (including escaped newlines/tabs) to keep downstream processing clean."""
+    return re.sub(r"(?:\s|\\[nrt])+", " ", value).strip()
 
 
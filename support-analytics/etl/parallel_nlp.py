@@ -0,0 +1,123 @@
+"""Process-pool sentiment scoring with one model instance per worker."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from etl.nlp_model import (
+    SENTIMENT_BATCH_SIZE,
+    SentimentResult,
+    TicketNLPProcessor,
+    check_sentiment_backend,
+)
+
+# Shards per worker: enough to even out uneven text lengths without paying
+# pickling overhead on tiny tasks.
+SHARDS_PER_WORKER = 4
+
+_worker_processor: Optional[TicketNLPProcessor] = None
+
+
+def _init_worker(
+    sentiment_model: str,
+    torch_threads: int,
+    backend: str,
+    onnx_model_dir: Optional[Path],
+) -> None:
+    """Load the model once per process; tasks then reuse ``_worker_processor``."""
+    global _worker_processor
+    os.environ["OMP_NUM_THREADS"] = str(torch_threads)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    try:
+        import torch
+
+        torch.set_num_threads(torch_threads)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):  # pragma: no cover - torch optional at runtime
+        pass
+    _worker_processor = TicketNLPProcessor(
+        sentiment_model,
+        backend=backend,
+        onnx_model_dir=onnx_model_dir,
+        threads=torch_threads,
+    ).warm_up()
+
+
+def _score_shard(texts: List[str], batch_size: int) -> List[Tuple[str, float, bool]]:
+    results, from_model = _worker_processor.score_texts(texts, batch_size=batch_size)
+    return [
+        (result.label, result.score, cacheable) for result, cacheable in zip(results, from_model)
+    ]
+
+
+class ParallelSentimentScorer:
+    """Shard sentiment scoring across a spawn-based process pool.
+
+    ``spawn`` keeps workers independent of the parent's torch/OpenMP state,
+    and each worker's intra-op threads are capped at ``torch_threads`` so
+    ``workers * torch_threads`` does not oversubscribe the host.
+    """
+
+    def __init__(
+        self,
+        sentiment_model: str,
+        workers: int,
+        torch_threads: Optional[int] = None,
+        backend: str = "torch",
+        onnx_model_dir: Optional[Path] = None,
+    ) -> None:
+        if workers < 2:
+            raise ValueError("ParallelSentimentScorer needs at least 2 workers")
+        # Fail here rather than in every worker's initializer.
+        check_sentiment_backend(backend, onnx_model_dir)
+        self.workers = workers
+        self.torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // workers)
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(sentiment_model, self.torch_threads, backend, onnx_model_dir),
+        )
+        logger.info(
+            "Started {} NLP workers with {} torch threads each", workers, self.torch_threads
+        )
+
+    def score(
+        self,
+        texts: Sequence[str],
+        batch_size: int = SENTIMENT_BATCH_SIZE,
+    ) -> Tuple[List[SentimentResult], List[bool]]:
+        """Score ``texts`` in contiguous shards; results keep the input order.
+
+        Like ``TicketNLPProcessor.score_texts``, also returns whether each
+        result came from the model rather than a worker's heuristic fallback.
+        """
+        if not texts:
+            return [], []
+        shard_count = min(self.workers * SHARDS_PER_WORKER, -(-len(texts) // batch_size))
+        shard_size = -(-len(texts) // shard_count)
+        shards = [
+            list(texts[start : start + shard_size]) for start in range(0, len(texts), shard_size)
+        ]
+        results: List[SentimentResult] = []
+        from_model: List[bool] = []
+        for shard in self._executor.map(_score_shard, shards, [batch_size] * len(shards)):
+            for label, score, cacheable in shard:
+                results.append(SentimentResult(label, score))
+                from_model.append(cacheable)
+        return results, from_model
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    def __enter__(self) -> "ParallelSentimentScorer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
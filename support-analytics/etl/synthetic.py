@@ -0,0 +1,206 @@
+"""Vectorized, sharded generation of the synthetic raw CSVs used for load testing."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# Below this many rows per shard, process start-up costs more than it saves.
+MIN_ROWS_PER_SHARD = 1_000_000
+WINDOW_DAYS = 120
+
+# (rng, first_index, row_count, window_start) -> frame of row_count rows.
+ShardBuilder = Callable[[np.random.Generator, int, int, np.datetime64], pd.DataFrame]
+
+
+def window_start(days: int = WINDOW_DAYS) -> np.datetime64:
+    """Start of the generated time window, anchored to today's UTC midnight.
+
+    Anchoring to the day (rather than ``now``) keeps a seeded run reproducible
+    within a day and gives every shard the same window.
+    """
+    today = np.datetime64(pd.Timestamp.utcnow().tz_localize(None).floor("D"), "s")
+    return today - np.timedelta64(days, "D")
+
+
+def random_minutes(
+    rng: np.random.Generator, start: np.datetime64, count: int, days: int = WINDOW_DAYS
+) -> np.ndarray:
+    """``count`` whole-minute timestamps uniformly spread over ``days`` from ``start``."""
+    minutes = rng.integers(0, days * 24 * 60, size=count, endpoint=True)
+    return start + minutes.astype("timedelta64[m]")
+
+
+def _ascii_digits(values: np.ndarray, width: int) -> np.ndarray:
+    """Zero-padded decimal digits of non-negative ints as a ``(n, width)`` uint8 array."""
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return (values[:, None] // powers % 10 + ord("0")).astype(np.uint8)
+
+
+def _ascii_strings(chars: np.ndarray) -> np.ndarray:
+    return chars.view(f"S{chars.shape[1]}").ravel().astype(str).astype(object)
+
+
+def format_timestamps(values: np.ndarray) -> np.ndarray:
+    """Format datetime64 values as ``YYYY-MM-DD HH:MM:SS``; NaT becomes ``""``.
+
+    Digits are written straight into a byte buffer: per-row ``strftime`` (or
+    pandas' datetime CSV formatting) dominates generation time otherwise.
+    """
+    seconds = values.astype("datetime64[s]")
+    missing = np.isnat(seconds)
+    seconds = np.where(missing, np.datetime64(0, "s"), seconds)
+    days = seconds.astype("datetime64[D]")
+    months = days.astype("datetime64[M]")
+    years = months.astype("datetime64[Y]")
+    fields = [
+        (years.astype(np.int64) + 1970, 4),
+        ((months - years).astype(np.int64) + 1, 2),
+        ((days - months).astype(np.int64) + 1, 2),
+    ]
+    clock = (seconds - days).astype(np.int64)
+    fields += [(clock // 3600, 2), (clock // 60 % 60, 2), (clock % 60, 2)]
+
+    chars = np.empty((len(seconds), 19), dtype=np.uint8)
+    chars[:, [4, 7]] = ord("-")
+    chars[:, 10] = ord(" ")
+    chars[:, [13, 16]] = ord(":")
+    column = 0
+    for value, width in fields:
+        chars[:, column : column + width] = _ascii_digits(value, width)
+        column += width + 1
+    text = _ascii_strings(chars)
+    text[missing] = ""
+    return text
+
+
+def prefixed_ids(prefix: str, numbers: np.ndarray, width: int = 0) -> np.ndarray:
+    """``f"{prefix}{number:0{width}d}"`` for every number, without a Python loop per row."""
+    numbers = np.asarray(numbers, dtype=np.int64)
+    lengths = np.searchsorted(10 ** np.arange(1, 19, dtype=np.int64), numbers, side="right") + 1
+    lengths = np.maximum(width, lengths)
+    head = np.frombuffer(prefix.encode("ascii"), dtype=np.uint8)
+    ids = np.empty(len(numbers), dtype=object)
+    for length in np.unique(lengths):
+        mask = lengths == length
+        chars = np.empty((int(mask.sum()), len(head) + length), dtype=np.uint8)
+        chars[:, : len(head)] = head
+        chars[:, len(head) :] = _ascii_digits(numbers[mask], length)
+        ids[mask] = _ascii_strings(chars)
+    return ids
+
+
+def pick(rng: np.random.Generator, choices: Sequence[str], count: int, p=None) -> np.ndarray:
+    return np.asarray(choices, dtype=object)[
+        rng.choice(len(choices), size=count, p=p)
+    ]
+
+
+def default_shard_count(record_count: int) -> int:
+    by_size = -(-record_count // MIN_ROWS_PER_SHARD)
+    return max(1, min(os.cpu_count() or 1, by_size))
+
+
+def shard_plan(record_count: int, shards: int) -> List[Tuple[int, int]]:
+    """Split ``record_count`` rows into ``(first_index, row_count)`` per shard."""
+    shards = max(1, min(shards, record_count or 1))
+    size, extra = divmod(record_count, shards)
+    plan, first = [], 0
+    for shard in range(shards):
+        count = size + (shard < extra)
+        plan.append((first, count))
+        first += count
+    return plan
+
+
+def build_frame(
+    builder: ShardBuilder,
+    record_count: int,
+    seed: int,
+    start: Optional[np.datetime64] = None,
+) -> pd.DataFrame:
+    """Build a single-shard frame in-process; matches ``write_sharded(shards=1)``."""
+    rng = np.random.default_rng(np.random.SeedSequence(seed).spawn(1)[0])
+    return builder(rng, 0, record_count, window_start() if start is None else start)
+
+
+def _write_shard(
+    builder: ShardBuilder,
+    seed: np.random.SeedSequence,
+    first: int,
+    count: int,
+    start: np.datetime64,
+    path: Path,
+    header: bool,
+) -> Path:
+    builder(np.random.default_rng(seed), first, count, start).to_csv(
+        path, index=False, header=header
+    )
+    return path
+
+
+def write_sharded(
+    builder: ShardBuilder,
+    record_count: int,
+    output_path: Path,
+    seed: int,
+    shards: Optional[int] = None,
+) -> Path:
+    """Generate ``record_count`` rows across ``shards`` worker processes.
+
+    Each shard draws from its own ``SeedSequence.spawn`` child and covers a
+    contiguous ID range, so output is reproducible for a given seed and shard
+    count and IDs stay unique. Shards are written as part files next to
+    ``output_path`` and concatenated in order.
+    """
+    shards = default_shard_count(record_count) if shards is None else shards
+    plan = shard_plan(record_count, shards)
+    seeds = np.random.SeedSequence(seed).spawn(len(plan))
+    start = window_start()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+
+    if len(plan) == 1:
+        _write_shard(builder, seeds[0], 0, record_count, start, output_path, True)
+    else:
+        parts = [
+            output_path.with_name(f"{output_path.stem}.part-{index:05d}{output_path.suffix}")
+            for index in range(len(plan))
+        ]
+        with ProcessPoolExecutor(
+            max_workers=min(len(plan), os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _write_shard, builder, shard_seed, first, count, start, part, index == 0
+                )
+                for index, (shard_seed, (first, count), part) in enumerate(
+                    zip(seeds, plan, parts)
+                )
+            ]
+            for future in futures:
+                future.result()
+        with open(output_path, "wb") as output:
+            for part in parts:
+                with open(part, "rb") as source:
+                    shutil.copyfileobj(source, output, 16 * 1024 * 1024)
+                part.unlink()
+
+    logger.success(
+        "Generated {} rows in {} shard(s) at {} in {:.2f}s",
+        record_count,
+        len(plan),
+        output_path,
+        time.perf_counter() - started,
+    )
+    return output_path
@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 import argparse
-import random
-from datetime import datetime, timedelta
-from typing import List
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
 
 import numpy as np
 import pandas as pd
@@ -13,6 +14,16 @@ from loguru import logger
 
 from config import get_settings
 from database.init_db import create_schema, load_telemetry
+from database.processed_store import write_processed
+from etl.incremental import DeltaTracker, read_raw_text
+from etl.synthetic import (
+    build_frame,
+    format_timestamps,
+    pick,
+    prefixed_ids,
+    random_minutes,
+    write_sharded,
+)
 
 PRODUCTS = [
     "Cohesity DataProtect",
@@ -34,42 +45,58 @@ EVENT_TYPES = [
     "Upgrade Event",
 ]
 
+CRITICAL_EVENT_TYPES = {"Security Alert", "Node Offline", "Snapshot Failure"}
+HEALTH_LEVELS = ["Normal", "Elevated", "High", "Critical"]
+PROCESSED_FILE = "telemetry_processed.csv"
+DELTA_FILE = "telemetry_delta.csv"
+
+# node_id -> product, filled lazily so each distinct node is hashed once.
+_PRODUCT_BY_NODE: Dict[str, str] = {}
+
+
+def build_telemetry_shard(
+    rng: np.random.Generator, first: int, count: int, start: np.datetime64
+) -> pd.DataFrame:
+    """Vectorized synthetic events with unique IDs ``EVT-{first:010d}`` onwards."""
+    created = random_minutes(rng, start, count)
+    return pd.DataFrame(
+        {
+            "event_id": prefixed_ids("EVT-", np.arange(first, first + count), width=10),
+            "node_id": prefixed_ids("NODE-", rng.integers(1, 300, size=count, endpoint=True)),
+            "event_type": pick(rng, EVENT_TYPES, count),
+            "response_time_ms": np.maximum(5, rng.normal(45, 20, count).astype(np.int64)),
+            "cpu_usage": np.clip(rng.normal(55, 18, count), 1, 100).round(2),
+            "storage_utilization": np.clip(rng.normal(68, 12, count), 5, 100).round(2),
+            "created_at": format_timestamps(created),
+        }
+    )
+
 
 def synthesize_telemetry_rows(record_count: int, seed: int = 7) -> pd.DataFrame:
-    random.seed(seed)
-    np.random.seed(seed)
     settings = get_settings()
-    start = datetime.utcnow() - timedelta(days=120)
-    rows: List[dict] = []
-    for _ in range(record_count):
-        created = start + timedelta(minutes=random.randint(0, 120 * 24 * 60))
-        node_id = f"NODE-{random.randint(1, 300)}"
-        rows.append(
-            {
-                "event_id": f"EVT-{random.randint(10_000, 99_999)}-{random.randint(0, 999)}",
-                "node_id": node_id,
-                "event_type": random.choice(EVENT_TYPES),
-                "response_time_ms": max(5, int(np.random.normal(45, 20))),
-                "cpu_usage": round(min(100, max(1, np.random.normal(55, 18))), 2),
-                "storage_utilization": round(
-                    min(100, max(5, np.random.normal(68, 12))), 2
-                ),
-                "created_at": created.strftime("%Y-%m-%d %H:%M:%S"),
-            }
-        )
-    df = pd.DataFrame(rows)
+    df = build_frame(build_telemetry_shard, record_count, seed)
     settings.telemetry_raw_path.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(settings.telemetry_raw_path, index=False)
     logger.success(
-        "Generated %s synthetic telemetry events at %s",
+        "Generated {} synthetic telemetry events at {}",
         len(df),
         settings.telemetry_raw_path,
     )
     return df
 
 
+def generate_raw_telemetry(
+    record_count: int, seed: int = 7, shards: Optional[int] = None
+) -> Path:
+    """Write the raw telemetry CSV in parallel shards without holding it in memory."""
+    return write_sharded(
+        build_telemetry_shard, record_count, get_settings().telemetry_raw_path, seed, shards
+    )
+
+
 def classify_health(row) -> str:
-    if row["event_type"] in {"Security Alert", "Node Offline", "Snapshot Failure"}:
+    """Row-wise reference for classify_health_frame."""
+    if row["event_type"] in CRITICAL_EVENT_TYPES:
         return "Critical"
     if row["cpu_usage"] > 85 or row["storage_utilization"] > 90:
         return "High"
@@ -78,15 +105,47 @@ def classify_health(row) -> str:
     return "Normal"
 
 
+def classify_health_frame(df: pd.DataFrame) -> pd.Categorical:
+    """Vectorized classify_health returning an ordered categorical."""
+    codes = np.select(
+        [
+            df["event_type"].isin(CRITICAL_EVENT_TYPES).to_numpy(),
+            ((df["cpu_usage"] > 85) | (df["storage_utilization"] > 90)).to_numpy(),
+            (df["response_time_ms"] > 80).to_numpy(),
+        ],
+        [
+            HEALTH_LEVELS.index("Critical"),
+            HEALTH_LEVELS.index("High"),
+            HEALTH_LEVELS.index("Elevated"),
+        ],
+        default=HEALTH_LEVELS.index("Normal"),
+    )
+    return pd.Categorical.from_codes(codes, categories=HEALTH_LEVELS, ordered=True)
+
+
 def assign_product(node_id: str) -> str:
-    index = abs(hash(node_id)) % len(PRODUCTS)
-    return PRODUCTS[index]
+    """Map a node to a product via crc32, so every process and host agrees."""
+    product = _PRODUCT_BY_NODE.get(node_id)
+    if product is None:
+        index = zlib.crc32(str(node_id).encode("utf-8")) % len(PRODUCTS)
+        product = _PRODUCT_BY_NODE[node_id] = PRODUCTS[index]
+    return product
+
+
+def assign_products(node_ids: pd.Series) -> pd.Categorical:
+    """Vectorized assign_product: look up each distinct node once, then broadcast."""
+    codes, uniques = pd.factorize(node_ids, use_na_sentinel=False)
+    product_codes = np.array(
+        [PRODUCTS.index(assign_product(node_id)) for node_id in uniques],
+        dtype=np.int8,
+    )
+    return pd.Categorical.from_codes(product_codes[codes], categories=PRODUCTS)
 
 
 def enrich_telemetry(df: pd.DataFrame) -> pd.DataFrame:
     df["created_at"] = pd.to_datetime(df["created_at"])
-    df["health_severity"] = df.apply(classify_health, axis=1)
-    df["product"] = df["node_id"].apply(assign_product)
+    df["health_severity"] = classify_health_frame(df)
+    df["product"] = assign_products(df["node_id"])
     df["response_time_bucket"] = pd.cut(
         df["response_time_ms"],
         bins=[0, 25, 50, 75, 100, 999],
@@ -96,166 +155,111 @@ def enrich_telemetry(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def persist_processed(df: pd.DataFrame, file_name: str = "telemetry_processed.csv") -> str:
-    settings = get_settings()
-    output_path = settings.processed_dir / file_name
-    df.to_csv(output_path, index=False)
-    logger.success("Saved processed telemetry to %s", output_path)
+def persist_processed(
+    df: pd.DataFrame,
+    file_name: str = PROCESSED_FILE,
+    append: bool = False,
+) -> str:
+    output_path = write_processed(df, file_name, append=append)
+    if not append:
+        logger.success("Saved processed telemetry to {}", output_path)
     return str(output_path)
 
 
 def run_telemetry_pipeline(
     generate_if_missing: bool = True,
     record_count: int = 7500,
+    incremental: bool = False,
 ) -> pd.DataFrame:
     settings = get_settings()
     if not settings.telemetry_raw_path.exists() and generate_if_missing:
-        synthesize_telemetry_rows(record_count=record_count)
-    df = pd.read_csv(settings.telemetry_raw_path)
-    df = enrich_telemetry(df)
-    persist_processed(df)
+        generate_raw_telemetry(record_count=record_count)
     create_schema()
+    tracker = (
+        DeltaTracker("telemetry", "event_id", settings.telemetry_raw_path) if incremental else None
+    )
+    if tracker is not None:
+        df, hashes = tracker.select(read_raw_text(settings.telemetry_raw_path))
+    else:
+        df = pd.read_csv(settings.telemetry_raw_path)
+    df = enrich_telemetry(df)
+    persist_processed(df, file_name=DELTA_FILE if incremental else PROCESSED_FILE)
     load_telemetry(df)
+    if tracker is not None:
+        tracker.commit(hashes)
+        tracker.finish()
     return df
 
 
-def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Telemetry ETL runner")
-    parser.add_argument(
-        "--generate-raw",
-        action="store_true",
-        help="Force regenerate of telemetry CSV before processing",
-    )
-    parser.add_argument(
-        "--records",
-        type=int,
-        default=7500,
-        help="Number of synthetic events to generate",
-    )
-    return parser.parse_args()
-
-
-if __name__ == "__main__":
-    args = parse_args()
-    if args.generate_raw:
-        synthesize_telemetry_rows(record_count=args.records)
-    run_telemetry_pipeline(generate_if_missing=True, record_count=args.records)
-"""Telemetry ETL pipeline for Cohesity-style node metrics."""
-
-from __future__ import annotations
-
-import argparse
-import random
-from datetime import datetime, timedelta
-from typing import List
-
-import numpy as np
-import pandas as pd
-from loguru import logger
-
-from config import get_settings
-
-PRODUCTS = [
-    "Cohesity DataProtect",
-    "Cohesity SmartFiles",
-    "Cohesity FortKnox",
-    "Cohesity SiteContinuity",
-]
-
-EVENT_TYPES = [
-    "IOPS Spike",
-    "CPU Spike",
-    "Node Offline",
-    "Snapshot Success",
-    "Snapshot Failure",
-    "Security Alert",
-    "Network Congestion",
-    "Disk Rebuild",
-    "Throughput Drop",
-    "Upgrade Event",
-]
-
+def stream_telemetry_pipeline(
+    chunk_size: int,
+    generate_if_missing: bool = True,
+    record_count: int = 7500,
+    incremental: bool = False,
+) -> int:
+    """Chunked variant of run_telemetry_pipeline with memory bounded by chunk_size.
 
-def synthesize_telemetry_rows(record_count: int, seed: int = 7) -> pd.DataFrame:
-    random.seed(seed)
-    np.random.seed(seed)
+    Returns the number of events processed.
+    """
     settings = get_settings()
-    start = datetime.utcnow() - timedelta(days=120)
-    rows: List[dict] = []
-    for _ in range(record_count):
-        created = start + timedelta(minutes=random.randint(0, 120 * 24 * 60))
-        node_id = f"NODE-{random.randint(1, 300)}"
-        rows.append(
-            {
-                "event_id": f"EVT-{random.randint(10_000, 99_999)}-{random.randint(0, 999)}",
-                "node_id": node_id,
-                "event_type": random.choice(EVENT_TYPES),
-                "response_time_ms": max(5, int(np.random.normal(45, 20))),
-                "cpu_usage": round(min(100, max(1, np.random.normal(55, 18))), 2),
-                "storage_utilization": round(
-                    min(100, max(5, np.random.normal(68, 12))), 2
-                ),
-                "created_at": created.strftime("%Y-%m-%d %H:%M:%S"),
-            }
-        )
-    df = pd.DataFrame(rows)
-    settings.telemetry_raw_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(settings.telemetry_raw_path, index=False)
-    logger.success(
-        "Generated %s synthetic telemetry events at %s",
-        len(df),
-        settings.telemetry_raw_path,
+    if not settings.telemetry_raw_path.exists() and generate_if_missing:
+        generate_raw_telemetry(record_count=record_count)
+    create_schema()
+    tracker = (
+        DeltaTracker("telemetry", "event_id", settings.telemetry_raw_path) if incremental else None
     )
-    return df
-
-
-def classify_health(row) -> str:
-    if row["event_type"] in {"Security Alert", "Node Offline", "Snapshot Failure"}:
-        return "Critical"
-    if row["cpu_usage"] > 85 or row["storage_utilization"] > 90:
-        return "High"
-    if row["response_time_ms"] > 80:
-        return "Elevated"
-    return "Normal"
-
-
-def assign_product(node_id: str) -> str:
-    index = (abs(hash(node_id)) % len(PRODUCTS))
-    return PRODUCTS[index]
 
-
-def enrich_telemetry(df: pd.DataFrame) -> pd.DataFrame:
-    df["created_at"] = pd.to_datetime(df["created_at"])
-    df["health_severity"] = df.apply(classify_health, axis=1)
-    df["product"] = df["node_id"].apply(assign_product)
-    df["response_time_bucket"] = pd.cut(
-        df["response_time_ms"],
-        bins=[0, 25, 50, 75, 100, 999],
-        labels=["<25ms", "25-50ms", "50-75ms", "75-100ms", "100ms+"],
-        include_lowest=True,
+    total = 0
+    started = time.perf_counter()
+    logger.info(
+        "Streaming telemetry from {} in chunks of {}",
+        settings.telemetry_raw_path,
+        chunk_size,
     )
-    return df
-
-
-def persist_processed(df: pd.DataFrame, file_name: str = "telemetry_processed.csv") -> str:
-    settings = get_settings()
-    output_path = settings.processed_dir / file_name
-    df.to_csv(output_path, index=False)
-    logger.success("Saved processed telemetry to %s", output_path)
-    return str(output_path)
-
-
-def run_telemetry_pipeline(
-    generate_if_missing: bool = True,
-    record_count: int = 7500,
-) -> pd.DataFrame:
-    settings = get_settings()
-    if not settings.telemetry_raw_path.exists() and generate_if_missing:
-        synthesize_telemetry_rows(record_count=record_count)
-    df = pd.read_csv(settings.telemetry_raw_path)
-    df = enrich_telemetry(df)
-    persist_processed(df)
-    return df
+    chunks = (
+        read_raw_text(settings.telemetry_raw_path, chunk_size)
+        if tracker is not None
+        else pd.read_csv(settings.telemetry_raw_path, chunksize=chunk_size)
+    )
+    for index, chunk in enumerate(chunks):
+        timings = {}
+        stage_started = time.perf_counter()
+        if tracker is not None:
+            chunk, hashes = tracker.select(chunk)
+            timings["delta"] = time.perf_counter() - stage_started
+            if chunk.empty:
+                continue
+            stage_started = time.perf_counter()
+        chunk = enrich_telemetry(chunk)
+        timings["enrich"] = time.perf_counter() - stage_started
+        stage_started = time.perf_counter()
+        persist_processed(
+            chunk,
+            file_name=DELTA_FILE if incremental else PROCESSED_FILE,
+            append=total > 0,
+        )
+        timings["persist"] = time.perf_counter() - stage_started
+        stage_started = time.perf_counter()
+        load_telemetry(chunk)
+        if tracker is not None:
+            tracker.commit(hashes)
+        timings["load"] = time.perf_counter() - stage_started
+        total += len(chunk)
+        logger.info(
+            "Telemetry chunk {}: {} rows in {:.2f}s ({})",
+            index,
+            len(chunk),
+            sum(timings.values()),
+            ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in timings.items()),
+        )
+    if tracker is not None:
+        tracker.finish()
+    logger.success(
+        "Streamed {} telemetry events in {:.2f}s",
+        total,
+        time.perf_counter() - started,
+    )
+    return total
 
 
 def parse_args() -> argparse.Namespace:
@@ -271,12 +275,40 @@ def parse_args() -> argparse.Namespace:
         default=7500,
         help="Number of synthetic events to generate",
     )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=None,
+        help="Generate the raw CSV in this many parallel shards (default: one per 1M rows, up to the core count)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="Stream the raw CSV in chunks of this many rows to bound memory",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only process raw rows that are new or changed since the last checkpoint",
+    )
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
     if args.generate_raw:
-        synthesize_telemetry_rows(record_count=args.records)
-    run_telemetry_pipeline(generate_if_missing=True, record_count=args.records)
-
+        generate_raw_telemetry(record_count=args.records, shards=args.shards)
+    if args.chunk_size:
+        stream_telemetry_pipeline(
+            chunk_size=args.chunk_size,
+            generate_if_missing=True,
+            record_count=args.records,
+            incremental=args.incremental,
+        )
+    else:
+        run_telemetry_pipeline(
+            generate_if_missing=True,
+            record_count=args.records,
+            incremental=args.incremental,
+        )
@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 import argparse
-import random
-from datetime import datetime, timedelta
-from typing import List
+import time
+from pathlib import Path
+from typing import Optional
 
 import numpy as np
 import pandas as pd
@@ -13,74 +13,110 @@ from loguru import logger
 
 from config import get_settings
 from database.init_db import create_schema, load_tickets, refresh_summary
-from etl.nlp_model import TicketNLPProcessor, sanitize_text
+from database.processed_store import write_processed
+from etl.incremental import DeltaTracker, read_raw_text
+from etl.nlp_model import (
+    NLP_CACHE_FILE,
+    NLPResultCache,
+    TicketNLPProcessor,
+    sanitize_text,
+)
+from etl.parallel_nlp import ParallelSentimentScorer
+from etl.synthetic import (
+    build_frame,
+    format_timestamps,
+    pick,
+    prefixed_ids,
+    random_minutes,
+    write_sharded,
+)
 
 SEVERITY_SCORE = {"Low": 1, "Medium": 2, "High": 3, "Critical": 4}
+PROCESSED_FILE = "tickets_processed.csv"
+DELTA_FILE = "tickets_delta.csv"
+
+
+TICKET_PRODUCTS = [
+    "Cohesity DataProtect",
+    "Cohesity SmartFiles",
+    "Cohesity FortKnox",
+    "Cohesity SiteContinuity",
+]
+ISSUE_TYPES = [
+    "Backup job failure due to snapshot metadata corruption",
+    "Deduplication ratio drop impacting cluster capacity",
+    "Replication lag between data centers",
+    "Ransomware anomaly detected via ML sensor",
+    "Restore throughput throttled below SLA",
+    "API token invalidation impacting automation",
+    "Node offline after firmware upgrade",
+    "Audit log ingestion halted",
+    "Storage domain marked read-only",
+    "S3 compatible endpoint intermittent",
+]
+SEVERITIES = ["Low", "Medium", "High", "Critical"]
+SEVERITY_WEIGHTS = [0.2, 0.45, 0.25, 0.1]
+STATUSES = ["Open", "In Progress", "Resolved", "Escalated"]
+
+
+def build_ticket_shard(
+    rng: np.random.Generator, first: int, count: int, start: np.datetime64
+) -> pd.DataFrame:
+    """Vectorized synthetic tickets ``TKT-{12000 + first}`` onwards."""
+    created = random_minutes(rng, start, count)
+    resolve_hours = rng.integers(4, 240, size=count, endpoint=True).astype("timedelta64[h]")
+    resolved = np.where(
+        rng.random(count) > 0.2, created + resolve_hours, np.datetime64("NaT")
+    )
+    return pd.DataFrame(
+        {
+            "ticket_id": prefixed_ids("TKT-", np.arange(12000 + first, 12000 + first + count)),
+            "customer_id": prefixed_ids(
+                "CUST-", rng.integers(100, 999, size=count, endpoint=True)
+            ),
+            "product": pick(rng, TICKET_PRODUCTS, count),
+            "issue_description": pick(rng, ISSUE_TYPES, count),
+            "severity": pick(rng, SEVERITIES, count, p=SEVERITY_WEIGHTS),
+            "status": pick(rng, STATUSES, count),
+            "created_at": format_timestamps(created),
+            "resolved_at": format_timestamps(resolved),
+        }
+    )
 
 
 def synthesize_ticket_rows(record_count: int, seed: int = 42) -> pd.DataFrame:
     """Create a synthetic ticket dataset resembling Cohesity workloads."""
-    random.seed(seed)
-    np.random.seed(seed)
     settings = get_settings()
-    products = [
-        "Cohesity DataProtect",
-        "Cohesity SmartFiles",
-        "Cohesity FortKnox",
-        "Cohesity SiteContinuity",
-    ]
-    issue_types = [
-        "Backup job failure due to snapshot metadata corruption",
-        "Deduplication ratio drop impacting cluster capacity",
-        "Replication lag between data centers",
-        "Ransomware anomaly detected via ML sensor",
-        "Restore throughput throttled below SLA",
-        "API token invalidation impacting automation",
-        "Node offline after firmware upgrade",
-        "Audit log ingestion halted",
-        "Storage domain marked read-only",
-        "S3 compatible endpoint intermittent",
-    ]
-    severities = ["Low", "Medium", "High", "Critical"]
-    statuses = ["Open", "In Progress", "Resolved", "Escalated"]
-    start = datetime.utcnow() - timedelta(days=120)
-    rows: List[dict] = []
-    for idx in range(record_count):
-        created = start + timedelta(minutes=random.randint(0, 120 * 24 * 60))
-        resolved = (
-            created + timedelta(hours=random.randint(4, 240))
-            if random.random() > 0.2
-            else None
-        )
-        rows.append(
-            {
-                "ticket_id": f"TKT-{12000+idx}",
-                "customer_id": f"CUST-{random.randint(100, 999)}",
-                "product": random.choice(products),
-                "issue_description": random.choice(issue_types),
-                "severity": random.choices(severities, weights=[0.2, 0.45, 0.25, 0.1])[0],
-                "status": random.choice(statuses),
-                "created_at": created.strftime("%Y-%m-%d %H:%M:%S"),
-                "resolved_at": resolved.strftime("%Y-%m-%d %H:%M:%S") if resolved else "",
-            }
-        )
-    df = pd.DataFrame(rows)
+    df = build_frame(build_ticket_shard, record_count, seed)
     settings.ticket_raw_path.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(settings.ticket_raw_path, index=False)
     logger.success(
-        "Generated %s synthetic tickets at %s",
+        "Generated {} synthetic tickets at {}",
         len(df),
         settings.ticket_raw_path,
     )
     return df
 
 
+def generate_raw_tickets(
+    record_count: int, seed: int = 42, shards: Optional[int] = None
+) -> Path:
+    """Write the raw ticket CSV in parallel shards without holding it in memory."""
+    return write_sharded(
+        build_ticket_shard, record_count, get_settings().ticket_raw_path, seed, shards
+    )
+
+
 def load_ticket_csv(path) -> pd.DataFrame:
-    logger.info("Loading tickets from %s", path)
+    logger.info("Loading tickets from {}", path)
     return pd.read_csv(path)
 
 
-def enrich_with_features(df: pd.DataFrame, nlp: TicketNLPProcessor) -> pd.DataFrame:
+def enrich_with_features(
+    df: pd.DataFrame,
+    nlp: TicketNLPProcessor,
+    batch_size: Optional[int] = None,
+) -> pd.DataFrame:
     df["issue_description"] = df["issue_description"].astype(str).apply(sanitize_text)
     df["created_at"] = pd.to_datetime(df["created_at"])
     df["resolved_at"] = pd.to_datetime(df["resolved_at"], errors="coerce")
@@ -88,46 +124,198 @@ def enrich_with_features(df: pd.DataFrame, nlp: TicketNLPProcessor) -> pd.DataFr
         (df["resolved_at"] - df["created_at"]).dt.total_seconds() / 3600
     ).fillna(0)
     df["severity_score"] = df["severity"].map(SEVERITY_SCORE).fillna(1)
-    df["predicted_category"] = df["issue_description"].apply(nlp.predict_category)
-    sentiments = df["issue_description"].apply(nlp.analyze_sentiment)
-    df["sentiment_label"] = sentiments.apply(lambda s: s.label)
-    df["sentiment_score"] = sentiments.apply(lambda s: round(s.score, 4))
+    df["predicted_category"] = nlp.predict_categories(df["issue_description"])
+    sentiments = nlp.analyze_sentiment_batch(
+        df["issue_description"].tolist(),
+        batch_size=batch_size or get_settings().sentiment_batch_size,
+    )
+    df["sentiment_label"] = [s.label for s in sentiments]
+    df["sentiment_score"] = [round(s.score, 4) for s in sentiments]
     return df
 
 
-def persist_processed(df: pd.DataFrame, file_name: str = "tickets_processed.csv") -> str:
-    settings = get_settings()
-    output_path = settings.processed_dir / file_name
-    df.to_csv(output_path, index=False)
-    logger.success("Saved processed tickets to %s", output_path)
+def persist_processed(
+    df: pd.DataFrame,
+    file_name: str = PROCESSED_FILE,
+    append: bool = False,
+) -> str:
+    output_path = write_processed(df, file_name, append=append)
+    if not append:
+        logger.success("Saved processed tickets to {}", output_path)
     return str(output_path)
 
 
-def run_ticket_pipeline(
-    generate_if_missing: bool = True,
-    record_count: int = 1500,
-) -> pd.DataFrame:
-    """Full pipeline orchestrator used by CLI/tests."""
+def build_nlp_cache() -> NLPResultCache:
+    """Build the NLP result cache, persisted under processed_dir when enabled."""
+    settings = get_settings()
+    path = settings.processed_dir / NLP_CACHE_FILE if settings.nlp_cache_persist else None
+    return NLPResultCache(max_entries=settings.nlp_cache_size, path=path)
+
+
+def build_sentiment_scorer(workers: Optional[int] = None) -> Optional[ParallelSentimentScorer]:
+    """Start a sentiment worker pool when more than one NLP worker is configured."""
+    settings = get_settings()
+    workers = workers or settings.nlp_workers
+    if workers <= 1:
+        return None
+    return ParallelSentimentScorer(
+        settings.huggingface_model,
+        workers,
+        torch_threads=settings.nlp_torch_threads or None,
+        backend=settings.sentiment_backend,
+        onnx_model_dir=settings.onnx_model_dir,
+    )
+
+
+def build_nlp_processor(
+    cache: Optional[NLPResultCache] = None,
+    scorer: Optional[ParallelSentimentScorer] = None,
+) -> TicketNLPProcessor:
     settings = get_settings()
-    nlp = TicketNLPProcessor(settings.huggingface_model)
+    return TicketNLPProcessor(
+        settings.huggingface_model,
+        cache=cache,
+        scorer=scorer,
+        backend=settings.sentiment_backend,
+        onnx_model_dir=settings.onnx_model_dir,
+    )
 
+
+def ensure_raw_tickets(generate_if_missing: bool, record_count: int) -> None:
+    settings = get_settings()
     if not settings.ticket_raw_path.exists() and generate_if_missing:
         logger.warning(
-            "ticket file missing at %s. Generating %s rows.",
+            "ticket file missing at {}. Generating {} rows.",
             settings.ticket_raw_path,
             record_count,
         )
-        synthesize_ticket_rows(record_count=record_count)
+        generate_raw_tickets(record_count=record_count)
 
-    df = load_ticket_csv(settings.ticket_raw_path)
-    df = enrich_with_features(df, nlp)
-    persist_processed(df)
+
+def run_ticket_pipeline(
+    generate_if_missing: bool = True,
+    record_count: int = 1500,
+    incremental: bool = False,
+    full_refresh: bool = False,
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Full pipeline orchestrator used by CLI/tests.
+
+    With ``incremental`` only raw rows that are new or changed since the last
+    checkpoint are enriched and loaded; they are written to the delta file
+    instead of replacing the full processed output. ticket_summary is kept
+    current by the loader; ``full_refresh`` rebuilds it from scratch instead.
+    ``workers`` > 1 scores sentiment in a process pool.
+    """
+    settings = get_settings()
+    ensure_raw_tickets(generate_if_missing, record_count)
     create_schema()
+
+    tracker = DeltaTracker("tickets", "ticket_id", settings.ticket_raw_path) if incremental else None
+    if tracker is not None:
+        df, hashes = tracker.select(read_raw_text(settings.ticket_raw_path))
+    else:
+        df = load_ticket_csv(settings.ticket_raw_path)
+    cache = build_nlp_cache()
+    scorer = None
+    try:
+        scorer = build_sentiment_scorer(workers)
+        nlp = build_nlp_processor(cache=cache, scorer=scorer)
+        df = enrich_with_features(df, nlp)
+    finally:
+        cache.close()
+        if scorer is not None:
+            scorer.close()
+    logger.info("NLP result cache: {}", cache.stats)
+    persist_processed(df, file_name=DELTA_FILE if incremental else PROCESSED_FILE)
     load_tickets(df)
-    refresh_summary()
+    if tracker is not None:
+        tracker.commit(hashes)
+        tracker.finish()
+    if full_refresh:
+        refresh_summary()
     return df
 
 
+def stream_ticket_pipeline(
+    chunk_size: int,
+    generate_if_missing: bool = True,
+    record_count: int = 1500,
+    incremental: bool = False,
+    full_refresh: bool = False,
+    workers: Optional[int] = None,
+) -> int:
+    """Process the raw CSV chunk by chunk so peak memory stays bounded by chunk_size.
+
+    Each chunk is enriched, appended to the processed output and loaded into the
+    database before the next one is read. Returns the number of rows processed.
+    """
+    settings = get_settings()
+    ensure_raw_tickets(generate_if_missing, record_count)
+    create_schema()
+    tracker = DeltaTracker("tickets", "ticket_id", settings.ticket_raw_path) if incremental else None
+
+    total = 0
+    started = time.perf_counter()
+    logger.info("Streaming tickets from {} in chunks of {}", settings.ticket_raw_path, chunk_size)
+    cache = build_nlp_cache()
+    scorer = None
+    try:
+        scorer = build_sentiment_scorer(workers)
+        nlp = build_nlp_processor(cache=cache, scorer=scorer)
+        chunks = (
+            read_raw_text(settings.ticket_raw_path, chunk_size)
+            if tracker is not None
+            else pd.read_csv(settings.ticket_raw_path, chunksize=chunk_size)
+        )
+        for index, chunk in enumerate(chunks):
+            timings = {}
+            stage_started = time.perf_counter()
+            if tracker is not None:
+                chunk, hashes = tracker.select(chunk)
+                timings["delta"] = time.perf_counter() - stage_started
+                if chunk.empty:
+                    continue
+                stage_started = time.perf_counter()
+            chunk = enrich_with_features(chunk, nlp)
+            timings["enrich"] = time.perf_counter() - stage_started
+            stage_started = time.perf_counter()
+            persist_processed(
+                chunk,
+                file_name=DELTA_FILE if incremental else PROCESSED_FILE,
+                append=total > 0,
+            )
+            timings["persist"] = time.perf_counter() - stage_started
+            stage_started = time.perf_counter()
+            load_tickets(chunk)
+            if tracker is not None:
+                tracker.commit(hashes)
+            timings["load"] = time.perf_counter() - stage_started
+            total += len(chunk)
+            logger.info(
+                "Ticket chunk {}: {} rows in {:.2f}s ({})",
+                index,
+                len(chunk),
+                sum(timings.values()),
+                ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in timings.items()),
+            )
+    finally:
+        cache.close()
+        if scorer is not None:
+            scorer.close()
+    logger.info("NLP result cache: {}", cache.stats)
+    if tracker is not None:
+        tracker.finish()
+    if full_refresh:
+        refresh_summary()
+    logger.success(
+        "Streamed {} tickets in {:.2f}s",
+        total,
+        time.perf_counter() - started,
+    )
+    return total
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Ticket ETL runner")
     parser.add_argument(
@@ -141,13 +329,57 @@ def parse_args() -> argparse.Namespace:
         default=1500,
         help="Number of synthetic tickets to generate when bootstrapping",
     )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=None,
+        help="Generate the raw CSV in this many parallel shards (default: one per 1M rows, up to the core count)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="Stream the raw CSV in chunks of this many rows to bound memory",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only process raw rows that are new or changed since the last checkpoint",
+    )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Rebuild ticket_summary from scratch instead of applying load deltas",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Score sentiment across this many worker processes (default: NLP_WORKERS)",
+    )
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
     if args.generate_raw:
-        synthesize_ticket_rows(record_count=args.records)
-    run_ticket_pipeline(generate_if_missing=True, record_count=args.records)
+        generate_raw_tickets(record_count=args.records, shards=args.shards)
+    if args.chunk_size:
+        stream_ticket_pipeline(
+            chunk_size=args.chunk_size,
+            generate_if_missing=True,
+            record_count=args.records,
+            incremental=args.incremental,
+            full_refresh=args.full_refresh,
+            workers=args.workers,
+        )
+    else:
+        run_ticket_pipeline(
+            generate_if_missing=True,
+            record_count=args.records,
+            incremental=args.incremental,
+            full_refresh=args.full_refresh,
+            workers=args.workers,
+        )
 
 
@@ -0,0 +1,81 @@
+"""Point every settings path at a throwaway directory before modules import config."""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+_TEST_DATA_DIR = Path(tempfile.mkdtemp(prefix="support-analytics-tests-"))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{(_TEST_DATA_DIR / 'test.db').as_posix()}")
+os.environ.setdefault("TICKET_RAW_PATH", (_TEST_DATA_DIR / "raw_tickets.csv").as_posix())
+os.environ.setdefault("TELEMETRY_RAW_PATH", (_TEST_DATA_DIR / "raw_telemetry.csv").as_posix())
+os.environ.setdefault("PROCESSED_DIR", (_TEST_DATA_DIR / "processed").as_posix())
+
+
+@pytest.fixture
+def fresh_db():
+    from database.init_db import create_schema
+    from database.session import Base, engine
+
+    Base.metadata.drop_all(bind=engine)
+    create_schema()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def _ticket_frame(status="Open", sentiment="negative") -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {
+                "ticket_id": f"TKT-{idx}",
+                "customer_id": "CUST-100",
+                "product": "Cohesity DataProtect",
+                "issue_description": "Backup job failure",
+                "severity": "High",
+                "status": status,
+                "created_at": "2024-01-01 10:00:00",
+                "resolved_at": "" if idx % 2 else "2024-01-02 10:00:00",
+                "resolution_hours": 0.0 if idx % 2 else 24.0,
+                "severity_score": 3,
+                "predicted_category": "Backup Failure",
+                "sentiment_label": sentiment,
+                "sentiment_score": 0.2,
+            }
+            for idx in range(5)
+        ]
+    )
+
+
+def _telemetry_frame(cpu_usage=50.0) -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {
+                "event_id": f"EVT-{idx}",
+                "node_id": "NODE-1",
+                "product": "Cohesity FortKnox",
+                "event_type": "CPU Spike",
+                "response_time_ms": 40,
+                "cpu_usage": cpu_usage,
+                "storage_utilization": 60.0,
+                "health_severity": "Normal",
+                "response_time_bucket": "25-50ms",
+                "created_at": "2024-01-01 10:00:00",
+            }
+            for idx in range(7)
+        ]
+    )
+
+
+@pytest.fixture
+def ticket_frame():
+    """Factory for a small processed-ticket frame (five tickets, one category)."""
+    return _ticket_frame
+
+
+@pytest.fixture
+def telemetry_frame():
+    """Factory for a small processed-telemetry frame (seven events on one node)."""
+    return _telemetry_frame
@@ -0,0 +1,345 @@
+import csv
+import io
+import json
+import re
+import time
+from dataclasses import replace
+from datetime import datetime
+
+import pytest
+from fastapi import Response
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from config import get_settings
+
+from api.cache import ResponseCache, response_cache
+from api.metrics import registry
+import api.main
+from api.main import app, create_app
+from api.queries import encode_cursor
+from database.init_db import load_telemetry, load_tickets
+from database.session import engine
+
+
+@pytest.fixture
+def client(fresh_db):
+    response_cache.clear()
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_ticket_aggregates_served_from_summary_match_live(client, ticket_frame):
+    frame = ticket_frame()
+    frame.loc[0, ["predicted_category", "sentiment_label"]] = ["Storage Capacity", "positive"]
+    load_tickets(frame)
+
+    summary = client.get("/api/tickets/top-categories").json()
+    live = client.get("/api/tickets/top-categories", params={"fresh": "true"}).json()
+    assert [(c["category"], c["ticket_count"]) for c in summary] == [
+        ("Backup Failure", 4),
+        ("Storage Capacity", 1),
+    ]
+    assert [{k: v for k, v in c.items() if k != "refreshed_at"} for c in summary] == [
+        {k: v for k, v in c.items() if k != "refreshed_at"} for c in live
+    ]
+    assert all(c["refreshed_at"] for c in summary)
+
+    sentiment = client.get("/api/tickets/sentiment-summary").json()
+    assert sentiment["positive_percent"] == 20.0
+    assert sentiment["negative_percent"] == 80.0
+    assert sentiment["refreshed_at"] is not None
+    live_sentiment = client.get("/api/tickets/sentiment-summary", params={"fresh": "true"}).json()
+    assert live_sentiment["positive_percent"] == sentiment["positive_percent"]
+
+
+def test_responses_are_cached_until_the_next_load(client, ticket_frame):
+    load_tickets(ticket_frame())
+
+    first = client.get("/api/tickets/top-categories")
+    assert first.headers["x-cache"] == "MISS"
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        second = client.get("/api/tickets/top-categories")
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json() == first.json()
+    assert statements == []  # the data version comes from memory
+
+    etag = second.headers["etag"]
+    not_modified = client.get("/api/tickets/top-categories", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+
+    frame = ticket_frame()
+    frame.loc[0, "predicted_category"] = "Storage Capacity"
+    load_tickets(frame)
+    # Until the next poll the previous stamp, and so the cached entry, still serves.
+    assert client.get("/api/tickets/top-categories").headers["x-cache"] == "HIT"
+    app.state.data_version.invalidate()
+    after_load = client.get("/api/tickets/top-categories", headers={"If-None-Match": etag})
+    assert after_load.status_code == 200
+    assert after_load.headers["x-cache"] == "MISS"
+    assert len(after_load.json()) == 2
+
+    bypass = client.get("/api/tickets/top-categories", headers={"Cache-Control": "no-cache"})
+    assert "x-cache" not in bypass.headers
+
+
+def test_data_version_poller_picks_up_loads(monkeypatch, fresh_db, ticket_frame):
+    monkeypatch.setattr(
+        api.main,
+        "get_settings",
+        lambda: replace(get_settings(), api_cache_version_poll_seconds=0.05),
+    )
+    response_cache.clear()
+    with TestClient(create_app()) as polling_client:
+        assert polling_client.get("/api/tickets/trends").headers["x-cache"] == "MISS"
+        load_tickets(ticket_frame())
+        deadline = time.monotonic() + 5
+        while polling_client.get("/api/tickets/trends").headers["x-cache"] == "HIT":
+            assert time.monotonic() < deadline, "poller never saw the load"
+            time.sleep(0.05)
+
+
+def test_response_cache_evicts_least_recent_and_expired_entries():
+    now = [0.0]
+    cache = ResponseCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    for key in ("a", "b"):
+        cache.store(key, Response(content=key))
+    assert cache.get("a") is not None
+    cache.store("c", Response(content="c"))
+    assert cache.get("b") is None
+    assert cache.get("a").body == b"a"
+
+    now[0] = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+# ticket_summary and data_versions hold one row per category / dataset.
+_FULL_SCAN = re.compile(r"^SCAN (tickets|ticket_nlp|telemetry)$")
+
+
+@pytest.mark.parametrize(
+    "path, params",
+    [
+        ("/api/tickets/top-categories", {"fresh": "true"}),
+        ("/api/tickets/sentiment-summary", {"fresh": "true"}),
+        ("/api/tickets/trends", {}),
+        ("/api/telemetry/events", {}),
+        ("/api/telemetry/events", {"product": "Cohesity DataProtect", "timeframe": 7}),
+        ("/api/telemetry/events", {"severity": "High"}),
+        ("/api/telemetry/rollups", {"timeframe": 10000}),
+        ("/api/telemetry/rollups", {"product": "Cohesity FortKnox", "timeframe": 10000}),
+        ("/api/telemetry/rollups", {"node_id": "NODE-1", "timeframe": 10000}),
+        (
+            "/api/telemetry/events",
+            {
+                "product": "Cohesity FortKnox",
+                "cursor": encode_cursor(datetime(2024, 1, 1, 10), 4),
+            },
+        ),
+    ],
+)
+def test_endpoint_queries_use_indexes(client, ticket_frame, telemetry_frame, path, params):
+    load_tickets(ticket_frame())
+    load_telemetry(telemetry_frame())
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        assert client.get(path, params=params).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert statements
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            details = [row.detail for row in plan]
+            assert not [d for d in details if _FULL_SCAN.match(d)], (statement, details)
+
+
+def test_telemetry_events_page_by_cursor(client, telemetry_frame):
+    frame = telemetry_frame()
+    frame.loc[[1, 5], "created_at"] = "2024-01-02 09:00:00"
+    frame.loc[6, "health_severity"] = "High"
+    load_telemetry(frame)
+
+    unpaged = [e["event_id"] for e in client.get("/api/telemetry/events").json()]
+    paged, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/telemetry/events", params=params)
+        paged += [e["event_id"] for e in page.json()]
+        cursor = page.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert paged == unpaged
+    assert unpaged[:2] == ["EVT-5", "EVT-1"]
+    assert len(set(paged)) == 7
+
+    first = client.get("/api/telemetry/events", params={"limit": 1, "severity": "Normal"})
+    rest = client.get(
+        "/api/telemetry/events",
+        params={"severity": "Normal", "cursor": first.headers["x-next-cursor"]},
+    )
+    assert "x-next-cursor" not in rest.headers
+    assert [e["event_id"] for e in rest.json()] == ["EVT-1", "EVT-4", "EVT-3", "EVT-2", "EVT-0"]
+
+    assert client.get("/api/telemetry/events", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_exports_stream_every_row(client, ticket_frame, telemetry_frame):
+    load_tickets(ticket_frame())
+    load_telemetry(telemetry_frame())
+
+    ndjson = client.get("/api/export/telemetry", params={"product": "Cohesity FortKnox"})
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    events = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [e["event_id"] for e in events] == [f"EVT-{idx}" for idx in range(7)]
+    assert events[0]["created_at"] == "2024-01-01T10:00:00"
+
+    exported = client.get("/api/export/tickets", params={"format": "csv"})
+    rows = list(csv.DictReader(io.StringIO(exported.text)))
+    assert len(rows) == 5
+    assert rows[0]["predicted_category"] == "Backup Failure"
+
+    compressed = client.get(
+        "/api/export/tickets",
+        params={"format": "csv", "compress": "true"},
+        headers={"Accept-Encoding": "identity"},
+    )
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.text == exported.text
+
+
+def test_async_router_matches_sync_router(client, monkeypatch, ticket_frame, telemetry_frame):
+    load_tickets(ticket_frame())
+    frame = telemetry_frame()
+    frame.loc[[1, 5], "created_at"] = "2024-01-02 09:00:00"
+    load_telemetry(frame)
+    monkeypatch.setattr(
+        api.main, "get_settings", lambda: replace(get_settings(), api_async_db=True)
+    )
+
+    requests = [
+        ("/api/tickets/top-categories", {}),
+        ("/api/tickets/top-categories", {"fresh": "true"}),
+        ("/api/tickets/sentiment-summary", {"fresh": "true"}),
+        ("/api/tickets/trends", {}),
+        ("/api/telemetry/events", {"limit": 3}),
+        ("/api/telemetry/rollups", {"granularity": "day", "timeframe": 10000}),
+    ]
+    sync_reads = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        sync_reads.append(statement)
+
+    with TestClient(create_app()) as async_client:
+        modules = {route.endpoint.__module__ for route in async_client.app.routes}
+        assert "api.async_router" in modules and "api.router" not in modules
+        # Cached requests take the data version from the async engine, not the sync pool.
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            for _ in range(2):
+                assert async_client.get("/api/tickets/trends").status_code == 200
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        assert sync_reads == []
+        for path, params in requests:
+            expected = client.get(path, params=params)
+            actual = async_client.get(path, params=params, headers={"Cache-Control": "no-cache"})
+            assert actual.status_code == 200
+            body, expected_body = actual.json(), expected.json()
+            if path.startswith("/api/tickets/") and params.get("fresh"):
+                # live aggregates stamp refreshed_at with the request time
+                body = _without_refreshed_at(body)
+                expected_body = _without_refreshed_at(expected_body)
+            assert body == expected_body
+            assert actual.headers.get("x-next-cursor") == expected.headers.get("x-next-cursor")
+
+
+def test_telemetry_rollups_merge_hours_into_days_and_weeks(client, telemetry_frame):
+    frame = telemetry_frame()
+    frame.loc[0:1, "created_at"] = "2024-01-01 14:00:00"
+    frame.loc[2, ["created_at", "node_id", "response_time_ms", "cpu_usage"]] = [
+        "2024-01-03 09:00:00",
+        "NODE-2",
+        500,
+        80.0,
+    ]
+    frame.loc[3, ["created_at", "health_severity"]] = ["2024-01-08 08:00:00", "High"]
+    load_telemetry(frame)
+    params = {"timeframe": 10000}
+
+    hourly = client.get("/api/telemetry/rollups", params=params).json()
+    assert [point["event_count"] for point in hourly] == [3, 2, 1, 1]
+
+    daily = client.get("/api/telemetry/rollups", params={**params, "granularity": "day"}).json()
+    assert [(p["period_start"], p["event_count"]) for p in daily] == [
+        ("2024-01-01T00:00:00", 5),
+        ("2024-01-03T00:00:00", 1),
+        ("2024-01-08T00:00:00", 1),
+    ]
+
+    weekly = client.get("/api/telemetry/rollups", params={**params, "granularity": "week"}).json()
+    assert [p["period_start"] for p in weekly] == ["2024-01-01T00:00:00", "2024-01-08T00:00:00"]
+    first = weekly[0]
+    assert first["event_count"] == 6
+    assert first["severity_counts"] == {"Normal": 6, "Elevated": 0, "High": 0, "Critical": 0}
+    assert first["event_type_counts"] == {"CPU Spike": 6}
+    assert first["avg_cpu_usage"] == 55.0 and first["max_cpu_usage"] == 80.0
+    # Nearest rank over the merged histogram {40: 5, 500: 1}.
+    assert (first["p50_response_time_ms"], first["p95_response_time_ms"]) == (40, 500)
+
+    node = client.get("/api/telemetry/rollups", params={**params, "node_id": "NODE-2"}).json()
+    assert [p["event_count"] for p in node] == [1]
+    assert client.get("/api/telemetry/rollups", params={"granularity": "month"}).status_code == 422
+
+
+def _without_refreshed_at(body):
+    if isinstance(body, list):
+        return [_without_refreshed_at(item) for item in body]
+    return {k: v for k, v in body.items() if k != "refreshed_at"}
+
+
+def _metric(body: str, name: str, **labels) -> float:
+    label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{re.escape(name)}{{{re.escape(label_text)}}} (\S+)$", body, re.M)
+    assert match, f"{name}{{{label_text}}} missing from /metrics"
+    return float(match.group(1))
+
+
+def test_metrics_report_route_latency_queries_and_rows(client, telemetry_frame):
+    registry.reset()
+    load_telemetry(telemetry_frame())
+    # Read the new data version outside any request so only route SQL is counted.
+    client.portal.call(app.state.data_version.refresh)
+    route = "/api/telemetry/events"
+
+    assert client.get(route, params={"limit": 2}).headers["x-cache"] == "MISS"
+    assert client.get(route, params={"limit": 2}).headers["x-cache"] == "HIT"
+    client.get("/api/does-not-exist")
+    response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    labels = {"method": "GET", "route": route}
+    assert _metric(body, "api_requests_total", **labels, status="2xx") == 2
+    assert _metric(body, "api_request_duration_seconds_count", **labels) == 2
+    assert _metric(body, "api_request_duration_seconds_bucket", **labels, le="+Inf") == 2
+    # The MISS runs the events query; the HIT adds no SQL and no rows.
+    assert _metric(body, "api_db_queries_total", **labels) == 1
+    assert _metric(body, "api_rows_returned_total", **labels) == 2
+    assert _metric(body, "api_requests_total", method="GET", route="unmatched", status="4xx") == 1
@@ -0,0 +1,178 @@
+from dataclasses import replace
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import func, select, text
+
+from database import models
+from database.init_db import (
+    create_schema,
+    load_telemetry,
+    load_tickets,
+    refresh_rollups,
+    refresh_summary,
+)
+from database.session import SessionLocal, engine
+
+
+def _count(model) -> int:
+    with SessionLocal() as session:
+        return session.execute(select(func.count()).select_from(model)).scalar_one()
+
+
+def test_load_tickets_upserts_idempotently(fresh_db, ticket_frame):
+    assert load_tickets(ticket_frame(), chunk_size=2) == 10
+    assert load_tickets(ticket_frame(), chunk_size=2) == 0
+    load_tickets(ticket_frame(status="Resolved", sentiment="positive"), chunk_size=2)
+    assert _count(models.Ticket) == 5
+    assert _count(models.TicketNLP) == 5
+    with SessionLocal() as session:
+        ticket = session.execute(
+            select(models.Ticket).where(models.Ticket.ticket_id == "TKT-1")
+        ).scalar_one()
+        assert ticket.status == "Resolved"
+        assert ticket.resolved_at is None
+        assert ticket.nlp.sentiment_label == "positive"
+
+
+def test_load_telemetry_upserts_idempotently(fresh_db, telemetry_frame):
+    assert load_telemetry(telemetry_frame(), chunk_size=3) == 7
+    assert load_telemetry(telemetry_frame(), chunk_size=3) == 0
+    changed = telemetry_frame()
+    changed.loc[2, "cpu_usage"] = 91.5
+    assert load_telemetry(changed, chunk_size=3) == 1
+    assert _count(models.TelemetryEvent) == 7
+    with SessionLocal() as session:
+        cpu = session.execute(select(func.max(models.TelemetryEvent.cpu_usage))).scalar_one()
+    assert cpu == 91.5
+
+
+def test_bulk_upsert_keeps_last_of_repeated_keys_in_a_chunk(fresh_db, telemetry_frame):
+    frame = telemetry_frame()
+    repeat = frame.iloc[[2]].assign(cpu_usage=88.0)
+    assert load_telemetry(pd.concat([frame, repeat], ignore_index=True), chunk_size=10) == 7
+    with SessionLocal() as session:
+        cpu = session.execute(
+            select(models.TelemetryEvent.cpu_usage).where(
+                models.TelemetryEvent.event_id == "EVT-2"
+            )
+        ).scalar_one()
+    assert cpu == 88.0
+
+
+def _summary() -> dict:
+    with SessionLocal() as session:
+        rows = session.execute(select(models.TicketSummary)).scalars().all()
+        return {
+            row.category: (
+                row.ticket_count,
+                round(row.total_resolution_hours, 6),
+                row.positive_count,
+                row.negative_count,
+                row.neutral_count,
+                round(row.avg_resolution_hours, 6),
+                round(row.positive_percent, 6),
+                round(row.negative_percent, 6),
+                round(row.neutral_percent, 6),
+            )
+            for row in rows
+        }
+
+
+def test_load_tickets_maintains_summary_incrementally(fresh_db, ticket_frame):
+    load_tickets(ticket_frame(), chunk_size=2)
+    first = _summary()
+    assert first["Backup Failure"][:5] == (5, 72.0, 0, 5, 0)
+
+    changed = ticket_frame()
+    changed.loc[0, ["predicted_category", "sentiment_label"]] = ["Storage Capacity", "neutral"]
+    changed.loc[1:4, "predicted_category"] = "Storage Capacity"
+    changed.loc[2, "resolution_hours"] = 10.0
+    extra = ticket_frame().assign(ticket_id=lambda f: f["ticket_id"] + "-new")
+    load_tickets(pd.concat([changed, extra], ignore_index=True), chunk_size=3)
+    incremental = _summary()
+
+    refresh_summary()
+    assert incremental == _summary()
+    assert incremental["Storage Capacity"][0] == 5
+
+
+def _rollups() -> dict:
+    with SessionLocal() as session:
+        rows = session.execute(select(models.TelemetryHourlyRollup)).scalars().all()
+        return {
+            (row.product, row.node_id, row.hour): (
+                row.event_count,
+                row.normal_count,
+                row.high_count,
+                row.event_type_counts,
+                round(row.cpu_usage_sum, 6),
+                row.cpu_usage_max,
+                row.response_time_histogram,
+                row.response_time_p50,
+                row.response_time_p95,
+            )
+            for row in rows
+        }
+
+
+def test_load_telemetry_maintains_rollups_incrementally(fresh_db, telemetry_frame):
+    load_telemetry(telemetry_frame(), chunk_size=3)
+    assert _rollups()[("Cohesity FortKnox", "NODE-1", datetime(2024, 1, 1, 10))][:3] == (7, 7, 0)
+
+    changed = telemetry_frame()
+    changed.loc[0, "created_at"] = "2024-01-01 11:30:00"  # moves to another hour
+    changed.loc[1, "node_id"] = "NODE-2"  # moves to another node
+    changed.loc[3, "product"] = "Cohesity DataProtect"  # same node and hour, new product
+    changed.loc[2, ["health_severity", "response_time_ms", "cpu_usage"]] = ["High", 900, 97.0]
+    load_telemetry(changed, chunk_size=3)
+    incremental = _rollups()
+
+    refresh_rollups()
+    assert incremental == _rollups()
+    assert len(incremental) == 4
+    hour = incremental[("Cohesity FortKnox", "NODE-1", datetime(2024, 1, 1, 10))]
+    assert hour[:3] == (4, 3, 1)
+    assert (hour[5], hour[7], hour[8]) == (97.0, 40, 900)
+
+
+def test_create_schema_rebuilds_summary_created_by_older_versions(fresh_db, ticket_frame):
+    load_tickets(ticket_frame())
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE ticket_summary"))
+        connection.execute(
+            text(
+                """
+                CREATE TABLE ticket_summary (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    category TEXT,
+                    ticket_count INTEGER,
+                    avg_resolution_hours REAL,
+                    positive_percent REAL,
+                    negative_percent REAL,
+                    neutral_percent REAL
+                )
+                """
+            )
+        )
+
+    create_schema()
+    assert _summary()["Backup Failure"][:5] == (5, 72.0, 0, 5, 0)
+    load_tickets(ticket_frame(sentiment="positive"))
+    assert _summary()["Backup Failure"][:5] == (5, 72.0, 5, 0, 0)
+
+
+def test_sqlite_engine_runs_in_wal_mode(fresh_db):
+    from config import get_settings
+    from database.session import build_engine, engine
+
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert connection.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+    assert engine.pool.size() == get_settings().db_pool_size
+
+    memory_engine = build_engine(replace(get_settings(), database_url="sqlite://"))
+    with memory_engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "memory"
+        assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1
@@ -1,9 +1,33 @@
+import os
+import subprocess
+import sys
+from dataclasses import replace
 from pathlib import Path
 
 import pandas as pd
+import pyarrow.parquet as pq
+import pytest
 
-from etl.ticket_etl import sanitize_text, synthesize_ticket_rows
-from etl.telemetry_etl import synthesize_telemetry_rows
+from config import get_settings
+import database.processed_store
+import etl.ticket_etl
+from database.init_db import get_checkpoint, initialize_database
+from etl.incremental import parse_raw_text, raw_row_hashes, read_raw_text
+from etl.ticket_etl import (
+    run_ticket_pipeline,
+    sanitize_text,
+    stream_ticket_pipeline,
+    synthesize_ticket_rows,
+)
+from etl.telemetry_etl import (
+    assign_product,
+    classify_health,
+    enrich_telemetry,
+    generate_raw_telemetry,
+    run_telemetry_pipeline,
+    stream_telemetry_pipeline,
+    synthesize_telemetry_rows,
+)
 
 
 def test_sanitize_text_removes_extra_spaces():
@@ -23,3 +47,165 @@ def test_telemetry_synthesis_output(tmp_path, monkeypatch):
     assert len(df) == 20
     assert {"event_id", "node_id", "event_type"}.issubset(df.columns)
 
+
+def test_vectorized_enrichment_matches_row_wise_functions():
+    raw = synthesize_telemetry_rows(record_count=500, seed=3)
+    raw.loc[0, ["event_type", "cpu_usage"]] = ["CPU Spike", 85.01]
+    raw.loc[1, ["event_type", "cpu_usage", "storage_utilization", "response_time_ms"]] = [
+        "CPU Spike",
+        85.0,
+        90.0,
+        81,
+    ]
+    expected_health = raw.apply(classify_health, axis=1)
+    expected_product = raw["node_id"].apply(assign_product)
+
+    enriched = enrich_telemetry(raw.copy())
+
+    assert enriched["health_severity"].astype(str).tolist() == expected_health.tolist()
+    assert enriched["product"].astype(str).tolist() == expected_product.tolist()
+    assert isinstance(enriched["health_severity"].dtype, pd.CategoricalDtype)
+    assert isinstance(enriched["product"].dtype, pd.CategoricalDtype)
+
+
+def test_assign_product_is_stable_across_interpreters():
+    script = (
+        "from etl.telemetry_etl import assign_product;"
+        "print([assign_product(f'NODE-{i}') for i in range(1, 40)])"
+    )
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=Path(__file__).resolve().parents[1],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        for seed in ("1", "2")
+    }
+    assert len(outputs) == 1
+    assert outputs.pop().strip() == str([assign_product(f"NODE-{i}") for i in range(1, 40)])
+
+
+def test_streamed_telemetry_matches_full_run(fresh_db):
+    processed = get_settings().processed_dir / "telemetry_processed.csv"
+    synthesize_telemetry_rows(record_count=50, seed=5)
+    run_telemetry_pipeline(generate_if_missing=False)
+    full = pd.read_csv(processed)
+
+    assert stream_telemetry_pipeline(chunk_size=20, generate_if_missing=False) == 50
+    pd.testing.assert_frame_equal(pd.read_csv(processed), full)
+
+
+def test_streamed_tickets_match_full_run(fresh_db):
+    processed = get_settings().processed_dir / "tickets_processed.csv"
+    synthesize_ticket_rows(record_count=30, seed=5)
+    run_ticket_pipeline(generate_if_missing=False)
+    full = pd.read_csv(processed)
+
+    assert stream_ticket_pipeline(chunk_size=7, generate_if_missing=False) == 30
+    pd.testing.assert_frame_equal(pd.read_csv(processed), full)
+
+
+def test_stream_closes_worker_pool_when_processor_setup_fails(fresh_db, monkeypatch):
+    closed = []
+
+    class _Scorer:
+        def close(self):
+            closed.append(True)
+
+    def _fail(**kwargs):
+        raise RuntimeError("model config")
+
+    monkeypatch.setattr(etl.ticket_etl, "build_sentiment_scorer", lambda workers: _Scorer())
+    monkeypatch.setattr(etl.ticket_etl, "build_nlp_processor", _fail)
+    synthesize_ticket_rows(record_count=5, seed=5)
+    with pytest.raises(RuntimeError):
+        stream_ticket_pipeline(chunk_size=2, generate_if_missing=False, workers=2)
+    assert closed == [True]
+
+
+def test_incremental_ticket_run_only_processes_changed_rows(fresh_db):
+    settings = get_settings()
+    synthesize_ticket_rows(record_count=20, seed=9)
+    assert len(run_ticket_pipeline(generate_if_missing=False, incremental=True)) == 20
+    assert run_ticket_pipeline(generate_if_missing=False, incremental=True).empty
+
+    raw = pd.read_csv(settings.ticket_raw_path)
+    raw.loc[3, "status"] = "Escalated" if raw.loc[3, "status"] != "Escalated" else "Open"
+    raw.to_csv(settings.ticket_raw_path, index=False)
+    delta = run_ticket_pipeline(generate_if_missing=False, incremental=True)
+
+    assert delta["ticket_id"].tolist() == [raw.loc[3, "ticket_id"]]
+    checkpoint = get_checkpoint("tickets")
+    assert (checkpoint.rows_seen, checkpoint.rows_processed) == (20, 1)
+    assert checkpoint.high_water_mark == pd.to_datetime(raw["created_at"]).max()
+
+
+def test_incremental_streamed_telemetry_skips_loaded_rows(fresh_db):
+    synthesize_telemetry_rows(record_count=40, seed=9)
+    first = stream_telemetry_pipeline(chunk_size=15, generate_if_missing=False, incremental=True)
+    assert first == pd.read_csv(get_settings().telemetry_raw_path)["event_id"].nunique()
+    assert stream_telemetry_pipeline(chunk_size=15, generate_if_missing=False, incremental=True) == 0
+
+
+def test_raw_row_hashes_do_not_depend_on_chunking(tmp_path):
+    path = tmp_path / "raw.csv"
+    path.write_text("event_id,response_time_ms,node_id\nEVT-1,45,N1\nEVT-2,,N2\nEVT-3,50,N3\n")
+    columns = ["event_id", "response_time_ms", "node_id"]
+    whole = raw_row_hashes(read_raw_text(path), columns)
+    chunked = pd.concat(raw_row_hashes(chunk, columns) for chunk in read_raw_text(path, 1))
+    assert whole.tolist() == chunked.tolist()
+
+    # The delta is parsed as a plain read_csv would parse it.
+    parsed = parse_raw_text(read_raw_text(path))
+    pd.testing.assert_frame_equal(parsed, pd.read_csv(path))
+
+
+def test_parquet_processed_output_round_trips_with_dtypes(fresh_db, monkeypatch):
+    parquet_settings = replace(get_settings(), processed_format="parquet")
+    monkeypatch.setattr(database.processed_store, "get_settings", lambda: parquet_settings)
+    synthesize_telemetry_rows(record_count=60, seed=3)
+    full = run_telemetry_pipeline(generate_if_missing=False)
+    assert stream_telemetry_pipeline(chunk_size=25, generate_if_missing=False) == 60
+
+    dataset = parquet_settings.processed_dir / "telemetry_processed.parquet"
+    assert len(list(dataset.glob("part-*.parquet"))) == 3
+    loaded = database.processed_store.load_processed("telemetry_processed.csv")
+    assert pd.api.types.is_datetime64_any_dtype(loaded["created_at"])
+    assert loaded["health_severity"].cat.ordered
+    expected = full.sort_values("event_id").reset_index(drop=True)
+    actual = loaded.sort_values("event_id").reset_index(drop=True)[expected.columns]
+    pd.testing.assert_frame_equal(actual, expected, check_categorical=False)
+
+    part = pq.ParquetFile(dataset / "part-00000.parquet")
+    days = [
+        part.metadata.row_group(index).column(
+            part.schema_arrow.get_field_index("created_at")
+        ).statistics
+        for index in range(part.num_row_groups)
+    ]
+    assert all(stat.min.date() == stat.max.date() for stat in days)
+
+    projected = database.processed_store.load_processed(
+        "telemetry_processed", columns=["event_id"]
+    )
+    assert list(projected.columns) == ["event_id"]
+
+    synthesize_ticket_rows(record_count=10, seed=3)
+    run_ticket_pipeline(generate_if_missing=False)
+    initialize_database()
+
+
+def test_sharded_telemetry_generation_is_reproducible_with_unique_ids():
+    path = get_settings().telemetry_raw_path
+
+    generate_raw_telemetry(record_count=1001, seed=11, shards=3)
+    first = pd.read_csv(path)
+    generate_raw_telemetry(record_count=1001, seed=11, shards=3)
+
+    pd.testing.assert_frame_equal(pd.read_csv(path), first)
+    assert len(first) == 1001 and first["event_id"].is_unique
+    assert not list(path.parent.glob("*.part-*"))
+    assert pd.to_datetime(first["created_at"]).notna().all()
@@ -0,0 +1,219 @@
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from etl.nlp_model import (
+    CATEGORY_RULES,
+    CategoryMatcher,
+    NLPResultCache,
+    OnnxSentimentPipeline,
+    SentimentResult,
+    TicketNLPProcessor,
+)
+from etl.parallel_nlp import ParallelSentimentScorer
+
+
+class _FakePipeline:
+    """Stand-in for the transformers pipeline that records batch shapes."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def __call__(self, inputs, **kwargs):
+        self.calls.append(list(inputs))
+        if self.fail:
+            raise RuntimeError("boom")
+        return [
+            {"label": "NEGATIVE" if "fail" in text else "POSITIVE", "score": 0.9}
+            for text in inputs
+        ]
+
+
+def _processor(pipeline=None, cache=None) -> TicketNLPProcessor:
+    nlp = TicketNLPProcessor("unused-model", cache=cache)
+    nlp._sentiment_pipeline = pipeline
+    return nlp
+
+
+def test_batch_sentiment_matches_per_row_heuristic():
+    nlp = _processor()
+    texts = ["Backup failure on node", "", "Restore success", "Quarterly review"]
+    assert nlp.analyze_sentiment_batch(texts, batch_size=2) == [
+        nlp.analyze_sentiment(text) for text in texts
+    ]
+
+
+def test_batch_sentiment_buckets_by_length_and_keeps_order():
+    fake = _FakePipeline()
+    nlp = _processor(fake)
+    texts = ["a much longer failure description", "ok", "fail", "medium text"]
+    results = nlp.analyze_sentiment_batch(texts, batch_size=2)
+    assert fake.calls == [["ok", "fail"], ["medium text", "a much longer failure description"]]
+    assert [r.label for r in results] == ["negative", "positive", "negative", "positive"]
+
+
+def test_batch_sentiment_falls_back_to_heuristic_on_error():
+    nlp = _processor(_FakePipeline(fail=True))
+    results = nlp.analyze_sentiment_batch(["Node offline after upgrade"])
+    assert results == [SentimentResult("negative", 0.2)]
+
+
+def test_heuristic_fallback_is_not_cached_as_model_output(tmp_path):
+    cache = NLPResultCache(path=tmp_path / "nlp_cache.sqlite")
+    failing = _processor(_FakePipeline(fail=True), cache=cache)
+    assert failing.analyze_sentiment_batch(["Restore failure"])[0].label == "negative"
+    assert failing.analyze_sentiment("Weekly review").label == "neutral"
+    assert len(cache) == 0
+    cache.close()
+
+    warm = NLPResultCache(path=tmp_path / "nlp_cache.sqlite")
+    recovered = _processor(_FakePipeline(), cache=warm)
+    assert recovered.analyze_sentiment("Weekly review").label == "positive"
+    assert warm.stats.disk_hits == 0
+    warm.close()
+
+
+def test_cache_scores_repeated_text_once_and_persists(tmp_path):
+    fake = _FakePipeline()
+    cache = NLPResultCache(path=tmp_path / "nlp_cache.sqlite")
+    nlp = _processor(fake, cache=cache)
+    texts = ["Backup failure", "Backup  failure", "Restore ok"] * 3
+    nlp.analyze_sentiment_batch(texts)
+    assert sum(len(call) for call in fake.calls) == 2
+    assert cache.stats.misses == 2
+    assert cache.stats.hits == 7
+    cache.close()
+
+    warm = NLPResultCache(path=tmp_path / "nlp_cache.sqlite")
+    rerun = _processor(_FakePipeline(fail=True), cache=warm)
+    assert rerun.analyze_sentiment("Backup failure").label == "negative"
+    assert rerun.predict_category("Backup failure") == "Backup Failure"
+    assert warm.stats.disk_hits == 1
+    warm.close()
+
+
+def test_cache_evicts_least_recently_used():
+    cache = NLPResultCache(max_entries=2)
+    cache.put("a", ("x",))
+    cache.put("b", ("y",))
+    cache.get("a")
+    cache.put("c", ("z",))
+    assert cache.get("b") is None
+    assert cache.get("a") == ("x",)
+    assert len(cache) == 2
+
+
+def _legacy_category(text, rules):
+    text_lower = text.lower()
+    for category, keywords in rules.items():
+        if category == "Other":
+            continue
+        if any(keyword in text_lower for keyword in keywords):
+            return category
+    return "Other"
+
+
+def test_category_matcher_keeps_first_match_wins_priority():
+    rules = {
+        "Short": ["back"],
+        "Long": ["backup", "kup"],
+        "Overlap": ["upload"],
+        "Other": [],
+    }
+    matcher = CategoryMatcher(rules)
+    texts = ["backup upload", "xbackupload", "kupload", "upload", "nothing", ""]
+    assert [matcher.match(text) for text in texts] == [
+        _legacy_category(text, rules) for text in texts
+    ]
+
+
+def test_category_matcher_series_matches_rule_loop():
+    rng = random.Random(3)
+    words = ["Backup", "slow", "LDAP", "disk", "alert", "node", "offline", "tier-2", "misc"]
+    texts = pd.Series([" ".join(rng.sample(words, 3)) for _ in range(300)])
+    predicted = CategoryMatcher(CATEGORY_RULES).match_series(texts)
+    assert predicted.tolist() == [_legacy_category(t, CATEGORY_RULES) for t in texts]
+
+
+def test_parallel_scorer_matches_serial_scoring_in_order():
+    rng = random.Random(5)
+    words = ["backup", "failure", "restored", "success", "node", "offline", "weekly", "review"]
+    texts = [" ".join(rng.choices(words, k=rng.randint(1, 6))) for _ in range(300)]
+    texts += texts[:50] + ["", "  "]
+    serial = _processor().analyze_sentiment_batch(texts, batch_size=8)
+
+    cache = NLPResultCache(max_entries=1000)
+    with ParallelSentimentScorer(
+        "unused-model", workers=2, torch_threads=1, backend="heuristic"
+    ) as scorer:
+        nlp = TicketNLPProcessor("unused-model", cache=cache, scorer=scorer, backend="heuristic")
+        assert nlp._sentiment_pipeline is None
+        assert nlp.analyze_sentiment_batch(texts, batch_size=8) == serial
+        assert nlp.analyze_sentiment(texts[0]) == serial[0]
+    assert cache.stats.misses == len(set(texts) - {"", "  "})
+
+
+class _FakeTokenizer:
+    def __call__(self, texts, **kwargs):
+        width = max(len(text.split()) for text in texts)
+        return {
+            "input_ids": [[len(text)] * width for text in texts],
+            "attention_mask": [[1] * width for _ in texts],
+            "token_type_ids": [[0] * width for _ in texts],
+        }
+
+
+class _FakeSession:
+    """Scores texts negative when their length is odd."""
+
+    def get_inputs(self):
+        return [SimpleNamespace(name="input_ids"), SimpleNamespace(name="attention_mask")]
+
+    def run(self, output_names, feeds):
+        assert set(feeds) == {"input_ids", "attention_mask"}
+        odd = feeds["input_ids"][:, 0] % 2 == 1
+        return [np.where(odd[:, None], [[2.0, 0.0]], [[0.0, 3.0]])]
+
+
+def test_onnx_pipeline_returns_pipeline_records():
+    onnx = OnnxSentimentPipeline(_FakeSession(), _FakeTokenizer(), {0: "NEGATIVE", 1: "POSITIVE"})
+    outputs = onnx(["odd", "even", "x"], batch_size=2)
+    assert [o["label"] for o in outputs] == ["NEGATIVE", "POSITIVE", "NEGATIVE"]
+    assert outputs[0]["score"] == pytest.approx(1 / (1 + np.exp(-2.0)))
+
+    nlp = TicketNLPProcessor("unused-model", backend="onnx")
+    nlp._sentiment_pipeline = onnx
+    assert [r.label for r in nlp.analyze_sentiment_batch(["odd", "even"])] == [
+        "negative",
+        "positive",
+    ]
+
+
+def test_sentiment_backend_selects_namespace_and_rejects_unknown():
+    cache = NLPResultCache(max_entries=10)
+    TicketNLPProcessor("m", cache=cache, backend="heuristic").analyze_sentiment("Backup failure")
+    onnx = TicketNLPProcessor("m", cache=cache, backend="onnx")
+    onnx._sentiment_pipeline = _FakePipeline()
+    onnx.analyze_sentiment("Backup failure")
+    assert cache.stats.misses == 2
+    assert TicketNLPProcessor("m", backend="heuristic").sentiment_backend == "heuristic"
+    assert TicketNLPProcessor("m", backend="heuristic").sentiment_available
+    assert _processor(_FakePipeline()).sentiment_available
+    assert not _processor().sentiment_available
+    assert _processor().sentiment_backend == "heuristic fallback"
+    with pytest.raises(ValueError):
+        TicketNLPProcessor("m", backend="tensorrt")
+
+
+def test_onnx_backend_without_exported_model_fails_fast(tmp_path):
+    with pytest.raises(ValueError):
+        TicketNLPProcessor("m", backend="onnx").analyze_sentiment("Backup failure")
+    nlp = TicketNLPProcessor("m", backend="onnx", onnx_model_dir=tmp_path)
+    with pytest.raises(FileNotFoundError):
+        nlp.analyze_sentiment_batch(["Backup failure"])
+    with pytest.raises(FileNotFoundError):
+        ParallelSentimentScorer("m", workers=2, backend="onnx", onnx_model_dir=tmp_path)
@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = {"spacy", "transformers", "torch"}
+
+
+def _import_times(module: str) -> dict:
+    """Cumulative import time in microseconds per module, from ``-X importtime``."""
+    env = {**os.environ, "PYTHONPATH": str(PROJECT_ROOT)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", ["etl.telemetry_etl", "api.main", "etl.nlp_model"])
+def test_startup_skips_nlp_dependencies(module):
+    times = _import_times(module)
+    heavy = {name for name in times if name.split(".")[0] in HEAVY_MODULES}
+    assert not heavy, f"importing {module} pulled in {sorted(heavy)}"